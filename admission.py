@@ -0,0 +1,243 @@
+"""
+Per-client admission control (ADMISSION in app.py).
+
+Every client (known API key, else IP) has two token buckets: one counted in
+requests and one in input characters. Both refill continuously up to
+their burst size, and a request is admitted only if both can pay for it;
+otherwise nothing is charged and the caller learns how long to wait.
+Pick a backend with ADMISSION_BACKEND: memory (per worker), sqlite
+(shared by every worker on the host) or redis (shared across hosts).
+"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Tuple
+
+
+class Decision(NamedTuple):
+    """retry_after is 0 when admitted; bucket names the budget that ran out."""
+    retry_after: float = 0.0
+    bucket: str = ""
+
+    @property
+    def allowed(self) -> bool:
+        return self.retry_after <= 0
+
+
+class Admission:
+    """
+    Interface shared by all backends.
+    Costs above a burst size are charged as the full burst, so one large
+    script drains the bucket instead of being refused forever. A budget
+    whose rate is 0 is not enforced.
+    """
+
+    blocking = False
+
+    def __init__(self, requests_per_second: float, request_burst: float, chars_per_second: float, char_burst: float):
+        self.requests_per_second = requests_per_second
+        self.request_burst = max(request_burst, 1.0)
+        self.chars_per_second = chars_per_second
+        self.char_burst = max(char_burst, 1.0)
+        self.admitted = 0
+        self.rejected = 0
+
+    def settle(
+        self, state: Tuple[float, float, float], requests: float, chars: float, now: float
+    ) -> Tuple[Decision, Tuple[float, float, float]]:
+        """
+        Refill (request tokens, char tokens, updated) to now and try to
+        charge the cost. Returns the decision and the state to keep.
+        """
+        req_tokens, char_tokens, updated = state
+        elapsed = max(now - updated, 0.0)
+        req_tokens = min(self.request_burst, req_tokens + elapsed * self.requests_per_second)
+        char_tokens = min(self.char_burst, char_tokens + elapsed * self.chars_per_second)
+        requests = min(requests, self.request_burst) if self.requests_per_second > 0 else 0.0
+        chars = min(chars, self.char_burst) if self.chars_per_second > 0 else 0.0
+
+        wait_req = self._wait(requests - req_tokens, self.requests_per_second)
+        wait_chars = self._wait(chars - char_tokens, self.chars_per_second)
+        if wait_req > 0 or wait_chars > 0:
+            self.rejected += 1
+            bucket = "requests" if wait_req >= wait_chars else "chars"
+            return Decision(max(wait_req, wait_chars), bucket), (req_tokens, char_tokens, now)
+        self.admitted += 1
+        return Decision(), (req_tokens - requests, char_tokens - chars, now)
+
+    @staticmethod
+    def _wait(deficit: float, rate: float) -> float:
+        return deficit / rate if deficit > 0 else 0.0
+
+    def full(self, now: float) -> Tuple[float, float, float]:
+        return (self.request_burst, self.char_burst, now)
+
+    def take(self, client: str, requests: float, chars: float) -> Decision:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {"backend": type(self).__name__, "admitted": self.admitted, "rejected": self.rejected}
+
+
+class MemoryAdmission(Admission):
+    """
+    Buckets in a bounded LRU dict of (request tokens, char tokens, updated)
+    tuples. An evicted client comes back with full buckets, which is what
+    its buckets would have refilled to anyway once idle long enough.
+    """
+
+    def __init__(self, *args, max_clients: int = 100_000):
+        super().__init__(*args)
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, Tuple[float, float, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def take(self, client: str, requests: float, chars: float) -> Decision:
+        now = time.monotonic()
+        state = self._buckets.pop(client, None) or self.full(now)
+        decision, self._buckets[client] = self.settle(state, requests, chars, now)
+        while len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return decision
+
+    def stats(self) -> dict:
+        return {**super().stats(), "clients": len(self._buckets)}
+
+
+class SQLiteAdmission(Admission):
+    """
+    Buckets in a SQLite table, shared by every worker on the host.
+    Each take() is one IMMEDIATE transaction, so workers never both spend
+    the same tokens. Idle rows are pruned at most once per sweep_seconds.
+    """
+
+    blocking = True
+
+    def __init__(self, *args, path: str, sweep_seconds: float = 60.0):
+        super().__init__(*args)
+        self.path = path
+        self.sweep_seconds = sweep_seconds
+        self._next_sweep = 0.0
+        self._local = threading.local()
+        with self._conn() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "client TEXT PRIMARY KEY, requests REAL NOT NULL, chars REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, client: str, requests: float, chars: float) -> Decision:
+        db = self._conn()
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute("SELECT requests, chars, updated FROM buckets WHERE client = ?", (client,)).fetchone()
+            decision, state = self.settle(tuple(row) if row else self.full(now), requests, chars, now)
+            db.execute("INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?)", (client, *state))
+            if now >= self._next_sweep:
+                self._next_sweep = now + self.sweep_seconds
+                db.execute("DELETE FROM buckets WHERE updated < ?", (now - self.idle_seconds(),))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return decision
+
+    def idle_seconds(self) -> float:
+        """How long until an untouched client's buckets are full again."""
+        rates = [self.request_burst / self.requests_per_second if self.requests_per_second > 0 else 0.0,
+                 self.char_burst / self.chars_per_second if self.chars_per_second > 0 else 0.0]
+        return max(rates + [self.sweep_seconds])
+
+
+# KEYS[1] = bucket hash; ARGV = now, requests, chars, request rate, request burst,
+# char rate, char burst. Returns {retry_after_ms, bucket}.
+REDIS_TAKE = """
+local state = redis.call('HMGET', KEYS[1], 'r', 'c', 't')
+local now = tonumber(ARGV[1])
+local rrate, rburst = tonumber(ARGV[4]), tonumber(ARGV[5])
+local crate, cburst = tonumber(ARGV[6]), tonumber(ARGV[7])
+local r = tonumber(state[1]) or rburst
+local c = tonumber(state[2]) or cburst
+local elapsed = math.max(now - (tonumber(state[3]) or now), 0)
+r = math.min(rburst, r + elapsed * rrate)
+c = math.min(cburst, c + elapsed * crate)
+local need_r = rrate > 0 and math.min(tonumber(ARGV[2]), rburst) or 0
+local need_c = crate > 0 and math.min(tonumber(ARGV[3]), cburst) or 0
+local wait_r, wait_c = 0, 0
+if need_r > r then wait_r = (need_r - r) / rrate end
+if need_c > c then wait_c = (need_c - c) / crate end
+if wait_r == 0 and wait_c == 0 then
+  r = r - need_r
+  c = c - need_c
+end
+redis.call('HSET', KEYS[1], 'r', tostring(r), 'c', tostring(c), 't', tostring(now))
+local idle = math.max(rrate > 0 and rburst / rrate or 0, crate > 0 and cburst / crate or 0, 1)
+redis.call('EXPIRE', KEYS[1], math.ceil(idle))
+if wait_r == 0 and wait_c == 0 then return {0, ''} end
+return {math.ceil(math.max(wait_r, wait_c) * 1000), wait_r >= wait_c and 'requests' or 'chars'}
+"""
+
+
+class RedisAdmission(Admission):
+    """
+    Buckets as Redis hashes, updated atomically by a Lua script so every
+    worker on every host shares them. Needs the redis package. Keys expire
+    once a client's buckets would have refilled.
+    """
+
+    blocking = True
+
+    def __init__(self, *args, url: str, prefix: str = "tts:admission:"):
+        super().__init__(*args)
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("ADMISSION_BACKEND=redis requires redis") from e
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url)
+        self._take = self._redis.register_script(REDIS_TAKE)
+
+    def take(self, client: str, requests: float, chars: float) -> Decision:
+        retry_ms, bucket = self._take(
+            keys=[self.prefix + client],
+            args=[time.time(), requests, chars, self.requests_per_second, self.request_burst,
+                  self.chars_per_second, self.char_burst],
+        )
+        if int(retry_ms) <= 0:
+            self.admitted += 1
+            return Decision()
+        self.rejected += 1
+        return Decision(int(retry_ms) / 1000, bucket.decode() if isinstance(bucket, bytes) else bucket)
+
+
+def create_admission(
+    backend: str, requests_per_minute: float, request_burst: float, chars_per_minute: float, char_burst: float, **options
+) -> Admission:
+    """
+    Build the backend named by ADMISSION_BACKEND.
+    options: max_clients (memory); path (sqlite); url (redis).
+    A rate of 0 turns that budget off.
+    """
+    limits = (requests_per_minute / 60, request_burst, chars_per_minute / 60, char_burst)
+    backend = (backend or "memory").strip().lower()
+    if backend == "memory":
+        return MemoryAdmission(*limits, max_clients=options.get("max_clients", 100_000))
+    if backend == "sqlite":
+        return SQLiteAdmission(*limits, path=options.get("path") or "admission.db")
+    if backend == "redis":
+        if not options.get("url"):
+            raise RuntimeError("ADMISSION_BACKEND=redis requires ADMISSION_REDIS_URL")
+        return RedisAdmission(*limits, url=options["url"])
+    raise ValueError(f"unknown ADMISSION_BACKEND: {backend}")
@@ -1,13 +1,30 @@
 import os
+import re
 import time
 import uuid
-import io
-from typing import Dict, Tuple, Optional
+import asyncio
+import bisect
+import hashlib
+import itertools
+import json
+import math
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Union
 
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import Response, StreamingResponse
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
-from openai import OpenAI
+import anyio
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+import metrics
+from admission import create_admission
+from providers import create_provider
+from storage import StoredClip, create_store
 
 # -----------------------------
 # Config
@@ -15,16 +32,770 @@ from openai import OpenAI
 TTL_SECONDS = int(os.getenv("AUDIO_TTL_SECONDS", "3600"))  # 1 hour default
 DEFAULT_VOICE = (os.getenv("DEFAULT_VOICE", "alloy") or "alloy").strip()
 DEFAULT_SPEED = float(os.getenv("DEFAULT_SPEED", "1.05"))
+TTS_MODEL = (os.getenv("TTS_MODEL", "gpt-4o-mini-tts") or "gpt-4o-mini-tts").strip()
+TTS_FORMAT = "mp3"
+# Synthesis provider: openai, or synthetic (deterministic offline MP3 for tests/benchmarks)
+TTS_PROVIDER = (os.getenv("TTS_PROVIDER", "openai") or "openai").strip().lower()
+SYNTHETIC_CHARS_PER_SECOND = float(os.getenv("SYNTHETIC_CHARS_PER_SECOND", "15"))
+SYNTHETIC_LATENCY = float(os.getenv("SYNTHETIC_LATENCY", "0"))
+# Byte budget for the synthesis cache (0 disables it)
+SYNTH_CACHE_MAX_BYTES = int(os.getenv("SYNTH_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Where stored clips live: memory (optionally spilling to disk), directory, sqlite, s3
+AUDIO_STORE_BACKEND = (os.getenv("AUDIO_STORE_BACKEND", "memory") or "memory").strip()
+AUDIO_STORE_DIR = (os.getenv("AUDIO_STORE_DIR", "audio_store") or "audio_store").strip()
+AUDIO_SQLITE_PATH = (os.getenv("AUDIO_SQLITE_PATH", "audio_store.db") or "audio_store.db").strip()
+AUDIO_S3_BUCKET = (os.getenv("AUDIO_S3_BUCKET", "") or "").strip()
+AUDIO_S3_PREFIX = os.getenv("AUDIO_S3_PREFIX", "audio/")
+# Set for MinIO or other S3-compatible services
+AUDIO_S3_ENDPOINT = (os.getenv("AUDIO_S3_ENDPOINT", "") or "").strip()
+# Snapshot directory for warm restarts of the memory store ("" = off)
+AUDIO_SNAPSHOT_DIR = (os.getenv("AUDIO_SNAPSHOT_DIR", "") or "").strip()
+AUDIO_CHECKPOINT_SECONDS = float(os.getenv("AUDIO_CHECKPOINT_SECONDS", "60"))
+# Bytes per read when streaming a clip that is not in memory or a local file
+AUDIO_READ_CHUNK_BYTES = int(os.getenv("AUDIO_READ_CHUNK_BYTES", str(1024 * 1024)))
+# Hard cap on bytes held in AUDIO_STORE (0 = unlimited; memory and directory backends)
+AUDIO_STORE_MAX_BYTES = int(os.getenv("AUDIO_STORE_MAX_BYTES", str(128 * 1024 * 1024)))
+# Directory for clips demoted out of memory ("" = drop them instead)
+AUDIO_SPILL_DIR = (os.getenv("AUDIO_SPILL_DIR", "") or "").strip()
+# Cap on bytes spilled to disk (0 = unlimited)
+AUDIO_DISK_MAX_BYTES = int(os.getenv("AUDIO_DISK_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+# Reads of a spilled clip before it is promoted back to memory
+AUDIO_PROMOTE_AFTER = int(os.getenv("AUDIO_PROMOTE_AFTER", "3"))
+# Ranges beyond this in one Range header are ignored (full clip is served)
+MAX_RANGES = int(os.getenv("MAX_RANGES", "16"))
+# Scripts longer than this are split and synthesized in parallel segments
+SEGMENT_MAX_CHARS = int(os.getenv("SEGMENT_MAX_CHARS", "1500"))
+# Upstream calls in flight per segmented request
+SEGMENT_CONCURRENCY = int(os.getenv("SEGMENT_CONCURRENCY", "4"))
+# Max items per /tts/batch request and upstream calls in flight for one batch
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "100"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+# Upstream HTTP transport (shared pool for every synthesis call)
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100"))
+UPSTREAM_MAX_KEEPALIVE = int(os.getenv("UPSTREAM_MAX_KEEPALIVE", "20"))
+UPSTREAM_KEEPALIVE_EXPIRY = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", "60"))
+UPSTREAM_HTTP2 = (os.getenv("UPSTREAM_HTTP2", "0") or "0").strip().lower() in ("1", "true", "yes")  # needs h2
+UPSTREAM_CONNECT_TIMEOUT = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT", "5"))
+UPSTREAM_READ_TIMEOUT = float(os.getenv("UPSTREAM_READ_TIMEOUT", "60"))
+UPSTREAM_WRITE_TIMEOUT = float(os.getenv("UPSTREAM_WRITE_TIMEOUT", "10"))
+UPSTREAM_POOL_TIMEOUT = float(os.getenv("UPSTREAM_POOL_TIMEOUT", "10"))
+# SDK retries of failed upstream calls (429, 5xx, connection errors), with backoff
+UPSTREAM_MAX_RETRIES = int(os.getenv("UPSTREAM_MAX_RETRIES", "2"))
+# Seconds between keep-warm pings to upstream (0 = off); keep below the keep-alive expiry
+UPSTREAM_KEEPWARM_SECONDS = float(os.getenv("UPSTREAM_KEEPWARM_SECONDS", "0"))
+# Hedged upstream calls (opt-in): race a second call once the first is slower
+# than the HEDGE_QUANTILE latency for its input length, within HEDGE_MAX_RATIO extra calls
+HEDGE_ENABLED = (os.getenv("HEDGE_ENABLED", "0") or "0").strip().lower() in ("1", "true", "yes")
+HEDGE_QUANTILE = float(os.getenv("HEDGE_QUANTILE", "0.9"))
+HEDGE_MAX_RATIO = float(os.getenv("HEDGE_MAX_RATIO", "0.05"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+# Circuit breaker: open after BREAKER_FAILURES consecutive failures or calls slower
+# than BREAKER_SLOW_SECONDS; probe again after BREAKER_COOLDOWN_SECONDS
+BREAKER_FAILURES = int(os.getenv("BREAKER_FAILURES", "5"))
+BREAKER_SLOW_SECONDS = float(os.getenv("BREAKER_SLOW_SECONDS", "30"))
+BREAKER_COOLDOWN_SECONDS = float(os.getenv("BREAKER_COOLDOWN_SECONDS", "15"))
+BREAKER_PROBES = int(os.getenv("BREAKER_PROBES", "1"))
+# Local CPU fallback engine in LOCAL_TTS_WORKERS processes (0 = off). LOCAL_TTS_COMMAND (required
+# when enabled) reads the script on stdin and writes MP3 on stdout; "{speed}" is substituted
+LOCAL_TTS_WORKERS = int(os.getenv("LOCAL_TTS_WORKERS", "0"))
+LOCAL_TTS_COMMAND = (os.getenv("LOCAL_TTS_COMMAND", "") or "").strip()
+LOCAL_TTS_TIMEOUT = float(os.getenv("LOCAL_TTS_TIMEOUT", "60"))
+# Routed to the local engine: quality="fast", inputs (segments, sentences) shorter than
+# LOCAL_TTS_MAX_CHARS (0 = off), and calls the upstream breaker would reject (LOCAL_TTS_ON_BREAKER)
+LOCAL_TTS_MAX_CHARS = int(os.getenv("LOCAL_TTS_MAX_CHARS", "0"))
+LOCAL_TTS_ON_BREAKER = (os.getenv("LOCAL_TTS_ON_BREAKER", "1") or "1").strip().lower() in ("1", "true", "yes")
+# Per-client admission (API key, else IP): token buckets refilled per minute in requests
+# and input characters, each with a burst size (a rate of 0 turns that budget off)
+ADMISSION_REQUESTS_PER_MINUTE = float(os.getenv("ADMISSION_REQUESTS_PER_MINUTE", "0"))
+ADMISSION_REQUEST_BURST = float(os.getenv("ADMISSION_REQUEST_BURST", "10"))
+ADMISSION_CHARS_PER_MINUTE = float(os.getenv("ADMISSION_CHARS_PER_MINUTE", "0"))
+ADMISSION_CHAR_BURST = float(os.getenv("ADMISSION_CHAR_BURST", "20000"))
+# Where buckets live: memory (per worker), sqlite (all workers on the host), redis (all hosts)
+ADMISSION_BACKEND = (os.getenv("ADMISSION_BACKEND", "memory") or "memory").strip()
+ADMISSION_SQLITE_PATH = (os.getenv("ADMISSION_SQLITE_PATH", "admission.db") or "admission.db").strip()
+ADMISSION_REDIS_URL = (os.getenv("ADMISSION_REDIS_URL", "") or "").strip()
+# API keys (comma-separated) that identify a client for admission; callers presenting
+# any other key are treated as anonymous and keyed by IP
+ADMISSION_API_KEYS = [k.strip() for k in os.getenv("ADMISSION_API_KEYS", "").split(",") if k.strip()]
+# Key anonymous clients by the last X-Forwarded-For hop (only behind a trusted proxy, e.g. Render)
+ADMISSION_TRUST_FORWARDED = (os.getenv("ADMISSION_TRUST_FORWARDED", "0") or "0").strip().lower() in ("1", "true", "yes")
+# Background jobs (POST /tts/jobs): jobs synthesized at once, and jobs allowed to wait
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_MAX_QUEUED = int(os.getenv("JOB_MAX_QUEUED", "1000"))
+# Seconds of silence before GET /tts/jobs/{id}/events sends a keep-alive comment
+JOB_EVENTS_KEEPALIVE_SECONDS = float(os.getenv("JOB_EVENTS_KEEPALIVE_SECONDS", "15"))
+# Chunk size used when forwarding upstream audio to the client
+STREAM_CHUNK_BYTES = int(os.getenv("STREAM_CHUNK_BYTES", "16384"))
 
 # -----------------------------
 # App & Client
 # -----------------------------
-app = FastAPI(title="Personal Voice TTS", version="1.1.0")
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm restart: reload the AUDIO_STORE snapshot on startup, checkpoint it
+    every AUDIO_CHECKPOINT_SECONDS, and write a final snapshot on shutdown.
+    Also keeps upstream connections warm when UPSTREAM_KEEPWARM_SECONDS > 0.
+    """
+    checkpoints = None
+    if AUDIO_SNAPSHOT_DIR and hasattr(AUDIO_STORE, "snapshot"):
+        await asyncio.to_thread(AUDIO_STORE.restore, AUDIO_SNAPSHOT_DIR)
+        checkpoints = asyncio.create_task(checkpoint_loop())
+    keepwarm = asyncio.create_task(keepwarm_loop()) if UPSTREAM_KEEPWARM_SECONDS > 0 else None
+    try:
+        yield
+    finally:
+        if keepwarm is not None:
+            keepwarm.cancel()
+        if checkpoints is not None:
+            checkpoints.cancel()
+            await asyncio.to_thread(AUDIO_STORE.snapshot, AUDIO_SNAPSHOT_DIR)
+        await JOBS.stop()
+        await PROVIDER.close()
+        if LOCAL is not None:
+            await LOCAL.close()
+
+
+app = FastAPI(title="Personal Voice TTS", version="1.1.0", lifespan=lifespan)
+
+
+class UpstreamStats:
+    """
+    Connection counters for the upstream client, fed by httpcore trace
+    events: every request, and every new TCP connect / TLS handshake.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.connects = 0
+        self.tls_handshakes = 0
+        self.keepwarm_pings = 0
+
+    async def on_request(self, request: httpx.Request) -> None:
+        self.requests += 1
+        request.extensions["trace"] = self.trace
+
+    async def trace(self, event: str, info: dict) -> None:
+        if event == "connection.connect_tcp.complete":
+            self.connects += 1
+        elif event == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+
+    def stats(self) -> dict:
+        reused = max(self.requests - self.connects, 0)
+        return {
+            "requests": self.requests,
+            "new_connections": self.connects,
+            "tls_handshakes": self.tls_handshakes,
+            "connection_reuse_ratio": round(reused / self.requests, 4) if self.requests else None,
+            "keepwarm_pings": self.keepwarm_pings,
+        }
+
+
+UPSTREAM_STATS = UpstreamStats()
+
+client: Optional[AsyncOpenAI] = None
+if TTS_PROVIDER == "openai":
+    client = AsyncOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        max_retries=UPSTREAM_MAX_RETRIES,
+        http_client=DefaultAsyncHttpxClient(
+            http2=UPSTREAM_HTTP2,
+            limits=httpx.Limits(
+                max_connections=UPSTREAM_MAX_CONNECTIONS,
+                max_keepalive_connections=UPSTREAM_MAX_KEEPALIVE,
+                keepalive_expiry=UPSTREAM_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                connect=UPSTREAM_CONNECT_TIMEOUT,
+                read=UPSTREAM_READ_TIMEOUT,
+                write=UPSTREAM_WRITE_TIMEOUT,
+                pool=UPSTREAM_POOL_TIMEOUT,
+            ),
+            event_hooks={"request": [UPSTREAM_STATS.on_request]},
+        ),
+    )
+
+PROVIDER = create_provider(
+    TTS_PROVIDER,
+    client=client,
+    model=TTS_MODEL,
+    response_format=TTS_FORMAT,
+    chunk_bytes=STREAM_CHUNK_BYTES,
+    chars_per_second=SYNTHETIC_CHARS_PER_SECOND,
+    latency=SYNTHETIC_LATENCY,
+    command=LOCAL_TTS_COMMAND,
+    workers=LOCAL_TTS_WORKERS,
+    timeout=LOCAL_TTS_TIMEOUT,
+)
+# Fallback engine; None when LOCAL_TTS_WORKERS is 0
+LOCAL = (
+    create_provider(
+        "local",
+        command=LOCAL_TTS_COMMAND,
+        workers=LOCAL_TTS_WORKERS,
+        timeout=LOCAL_TTS_TIMEOUT,
+        chunk_bytes=STREAM_CHUNK_BYTES,
+    )
+    if LOCAL_TTS_WORKERS > 0
+    else None
+)
+
+
+class SynthesisCache:
+    """
+    LRU cache of synthesized audio, bounded by total bytes.
+    Keys are content hashes of everything that affects the audio,
+    so identical requests skip the upstream call entirely.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._items: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, voice: str, speed: float, input_text: str, response_format: str) -> str:
+        h = hashlib.sha256()
+        for part in (model, voice, repr(float(speed)), response_format, input_text):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._items.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        size = len(data)
+        if not data or size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._items[key] = data
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= len(evicted)
+
+
+SYNTH_CACHE = SynthesisCache(SYNTH_CACHE_MAX_BYTES)
+
+
+class Flight:
+    """
+    One in-flight upstream synthesis. The producer pushes chunks as they
+    arrive; any number of callers can follow along from the first chunk.
+    Once the producer calls stop_replay(), chunks are only kept until
+    every live follower has read them, and later followers start at the
+    newest chunk.
+    """
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.offset = 0  # chunks already dropped from the front of self.chunks
+        self.replay = True
+        self.done = False
+        self.abandoned = False  # last follower left; the task is being cancelled
+        self.error: Optional[BaseException] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+        self._positions: Dict[int, int] = {}
+
+    def _wake(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _trim(self) -> None:
+        if self.replay:
+            return
+        low = min(self._positions.values(), default=self.offset + len(self.chunks))
+        if low > self.offset:
+            del self.chunks[:low - self.offset]
+            self.offset = low
+
+    def stop_replay(self) -> None:
+        self.replay = False
+        self._trim()
+
+    def push(self, chunk: bytes) -> None:
+        self.chunks.append(chunk)
+        self._trim()
+        self._wake()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.error = error
+        self.done = True
+        self._wake()
+
+    async def follow(self) -> AsyncIterator[bytes]:
+        i = self.offset if self.replay else self.offset + len(self.chunks)
+        token = object()
+        self._positions[id(token)] = i
+        try:
+            while True:
+                while i < self.offset + len(self.chunks):
+                    chunk = self.chunks[i - self.offset]
+                    i += 1
+                    self._positions[id(token)] = i
+                    yield chunk
+                if self.done:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                await self._changed.wait()
+        finally:
+            del self._positions[id(token)]
+            self._trim()
+            if not self._positions and not self.done and self.task is not None:
+                # Nobody is waiting for the audio any more. New callers must not
+                # join it while the cancellation is still being delivered.
+                self.abandoned = True
+                self.task.cancel()
+
+    async def result(self) -> bytes:
+        return b"".join([chunk async for chunk in self.follow()])
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent syntheses: the first caller for a key
+    starts the upstream call in a background task, later callers follow it.
+    The task outlives any single caller, so a client disconnecting does not
+    cut off the others; it is cancelled once its last follower is gone,
+    and a caller arriving after that starts a fresh flight.
+    """
+
+    def __init__(self):
+        self.leaders = 0
+        self.coalesced = 0
+        self._flights: Dict[str, Flight] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def join(self, key: str, produce: Callable[[Flight], Awaitable[None]]) -> Flight:
+        flight = self._flights.get(key)
+        if flight is not None and not flight.abandoned:
+            self.coalesced += 1
+            return flight
+
+        flight = self._flights[key] = Flight()
+        self.leaders += 1
+
+        async def run() -> None:
+            try:
+                await produce(flight)
+                flight.finish()
+            except asyncio.CancelledError as e:
+                flight.finish(e)
+                raise
+            except Exception as e:
+                flight.finish(e)
+            finally:
+                self.forget(key, flight)
+
+        flight.task = asyncio.create_task(run())
+        return flight
+
+    def forget(self, key: str, flight: Flight) -> None:
+        """Stop handing `flight` to new callers; it keeps running for its followers."""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+
+IN_FLIGHT = SingleFlight()
+
+
+class JobQueueFull(RuntimeError):
+    pass
+
+
+class Job:
+    """
+    A background synthesis; progress counts finished segments.
+    Progress is also kept as an event log that any number of subscribers
+    can follow from any point, ending with a done or error event.
+    """
+
+    def __init__(self, job_id: str, segments: List[str], voice: str, speed: float, quality: str, priority: int):
+        self.id = job_id
+        self.segments = segments
+        self.voice = voice
+        self.speed = speed
+        self.quality = quality
+        self.priority = priority
+        self.status = "queued"
+        self.done = 0
+        self.audio_id: Optional[str] = None
+        self.error: Optional[str] = None
+        self.finished: Optional[float] = None
+        self.ready = 0  # segments playable in order from the start
+        self.ready_bytes = 0
+        self.events: List[Tuple[str, dict]] = []
+        self._changed = asyncio.Event()
+
+    @property
+    def progress(self) -> float:
+        return self.done / len(self.segments) if self.segments else 1.0
+
+    def emit(self, name: str, data: dict) -> None:
+        self.events.append((name, data))
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def finish(self, error: Optional[str] = None) -> None:
+        self.status = "error" if error else "done"
+        self.error = error
+        self.finished = time.time()
+        if error:
+            self.emit("error", {"error": error})
+        else:
+            self.emit("done", {"audio_id": self.audio_id, "expires_in_seconds": TTL_SECONDS})
+
+    async def follow(self, start: int = 0, idle: float = 0) -> AsyncIterator[Optional[Tuple[int, str, dict]]]:
+        """
+        Yield (event id, name, data) from event id `start` until the job
+        finishes; yields None after `idle` quiet seconds (0 = never).
+        """
+        i = max(start, 0)
+        while True:
+            while i < len(self.events):
+                name, data = self.events[i]
+                yield i, name, data
+                i += 1
+            if self.finished is not None:
+                return
+            try:
+                await asyncio.wait_for(self._changed.wait(), idle or None)
+            except asyncio.TimeoutError:
+                yield None
+
+
+class JobQueue:
+    """
+    Jobs wait in a priority queue (higher priority first, FIFO within a
+    priority) drained by a fixed pool of workers, so spikes queue up
+    instead of fanning out upstream. Workers start with the first job.
+    Finished jobs stay visible for keep_seconds.
+    """
+
+    def __init__(self, run: Callable[[Job], Awaitable[None]], workers: int, max_queued: int, keep_seconds: float):
+        self.run = run
+        self.workers = max(workers, 1)
+        self.max_queued = max_queued
+        self.keep_seconds = keep_seconds
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self._jobs: Dict[str, Job] = {}
+        self._finished: Deque[Job] = deque()
+        self._queue: "asyncio.PriorityQueue[Tuple[int, int, Job]]" = asyncio.PriorityQueue()
+        self._seq = itertools.count()
+        self._tasks: List[asyncio.Task] = []
+
+    def submit(self, job: Job) -> None:
+        """Queue a job; raises JobQueueFull when max_queued jobs are already waiting."""
+        self.prune()
+        if self.max_queued and self._queue.qsize() >= self.max_queued:
+            raise JobQueueFull("job queue is full")
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._jobs[job.id] = job
+        self._queue.put_nowait((-job.priority, next(self._seq), job))
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self.prune()
+        return self._jobs.get(job_id)
+
+    def prune(self) -> None:
+        cutoff = time.time() - self.keep_seconds
+        while self._finished and self._finished[0].finished < cutoff:
+            self._jobs.pop(self._finished.popleft().id, None)
+
+    async def _work(self) -> None:
+        while True:
+            _, _, job = await self._queue.get()
+            job.status = "running"
+            self.running += 1
+            try:
+                await self.run(job)
+                job.finish()
+                self.completed += 1
+            except asyncio.CancelledError:
+                job.finish("cancelled")
+                raise
+            except Exception as e:
+                job.finish(f"TTS failed: {str(e)}")
+                self.failed += 1
+            finally:
+                self.running -= 1
+                self._finished.append(job)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+class Hedger:
+    """
+    Adaptive hedging policy for upstream calls.
+    Latencies are tracked per input-length bucket (powers of two); a hedge
+    fires once a call outlives the bucket's HEDGE_QUANTILE latency, and
+    hedges are capped at HEDGE_MAX_RATIO of all calls.
+    """
+
+    def __init__(self, enabled: bool, quantile: float, max_ratio: float, min_samples: int, window: int = 256):
+        self.enabled = enabled
+        self.quantile = quantile
+        self.max_ratio = max_ratio
+        self.min_samples = min_samples
+        self.calls = 0
+        self.fired = 0
+        self.won = 0
+        self._samples: Dict[int, Deque[float]] = {}
+        self._window = window
+
+    @staticmethod
+    def bucket(size: int) -> int:
+        return size.bit_length()
+
+    def observe(self, size: int, seconds: float) -> None:
+        samples = self._samples.get(self.bucket(size))
+        if samples is None:
+            samples = self._samples[self.bucket(size)] = deque(maxlen=self._window)
+        samples.append(seconds)
+
+    def delay(self, size: int) -> Optional[float]:
+        """Hedge delay for a new call, or None to send it unhedged."""
+        if not self.enabled:
+            return None
+        self.calls += 1
+        samples = self._samples.get(self.bucket(size))
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(int(len(ordered) * self.quantile), len(ordered) - 1)]
+
+    def allow(self) -> bool:
+        """Reserve a hedge if the extra-load budget has room."""
+        if self.fired + 1 > self.max_ratio * self.calls:
+            return False
+        self.fired += 1
+        return True
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "calls": self.calls, "fired": self.fired, "won": self.won}
+
+
+HEDGER = Hedger(HEDGE_ENABLED, HEDGE_QUANTILE, HEDGE_MAX_RATIO, HEDGE_MIN_SAMPLES)
+
+
+class CircuitOpenError(RuntimeError):
+    """Upstream is considered down; retry after retry_after seconds."""
+
+    def __init__(self, retry_after: float):
+        super().__init__("upstream unavailable (circuit open)")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Fails fast when upstream is unhealthy.
+    closed: calls flow; `failures` consecutive errors or calls slower than
+    `slow_seconds` open the circuit.
+    open: calls raise CircuitOpenError until `cooldown` has passed.
+    half_open: up to `probes` trial calls; a success closes the circuit,
+    a failure reopens it.
+    """
+
+    def __init__(self, failures: int, slow_seconds: float, cooldown: float, probes: int):
+        self.failures = failures
+        self.slow_seconds = slow_seconds
+        self.cooldown = cooldown
+        self.probes = probes
+        self.state = "closed"
+        self.opened = 0
+        self.rejected = 0
+        self._streak = 0
+        self._opened_at = 0.0
+        self._trials = 0
+
+    def before(self) -> None:
+        """Admit a call or raise CircuitOpenError."""
+        if self.state == "closed":
+            return
+        if self.state == "open":
+            remaining = self._opened_at + self.cooldown - time.monotonic()
+            if remaining > 0:
+                self.rejected += 1
+                raise CircuitOpenError(remaining)
+            self.state = "half_open"
+            self._trials = 0
+        if self._trials >= self.probes:
+            self.rejected += 1
+            raise CircuitOpenError(self.cooldown)
+        self._trials += 1
+
+    def admits(self) -> bool:
+        """Whether before() would let a call through right now, without counting it."""
+        if self.state == "open" and self._opened_at + self.cooldown > time.monotonic():
+            return False
+        return self.state != "half_open" or self._trials < self.probes
+
+    def release(self) -> None:
+        """An admitted call ended without a verdict (e.g. cancelled)."""
+        if self.state == "half_open" and self._trials:
+            self._trials -= 1
+
+    def record(self, ok: bool, seconds: float) -> None:
+        if ok and seconds <= self.slow_seconds:
+            self._streak = 0
+            if self.state == "half_open":
+                self.state = "closed"
+            return
+        self._streak += 1
+        if self.state == "half_open" or self._streak >= self.failures:
+            if self.state != "open":
+                self.opened += 1
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+    @asynccontextmanager
+    async def guard(self):
+        self.before()
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.record(False, time.perf_counter() - started)
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record(True, time.perf_counter() - started)
+
+    def stats(self) -> dict:
+        return {"state": self.state, "opened": self.opened, "rejected": self.rejected}
+
+
+BREAKER = CircuitBreaker(BREAKER_FAILURES, BREAKER_SLOW_SECONDS, BREAKER_COOLDOWN_SECONDS, BREAKER_PROBES)
+
+
+# -----------------------------
+# Metrics
+# -----------------------------
+INPUT_CHAR_BUCKETS = (256, 1024, 4096, 16384)
+HTTP_STATE = {"in_flight": 0}
+
+REGISTRY = metrics.Registry()
+HTTP_LATENCY = REGISTRY.histogram(
+    "tts_http_request_duration_seconds",
+    "HTTP request latency until the body is sent.",
+    ("route", "method", "status"),
+)
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    "tts_upstream_duration_seconds",
+    "Upstream synthesis latency by input length bucket.",
+    ("input_chars_le",),
+)
+AUDIO_BYTES = REGISTRY.counter("tts_audio_bytes_total", "MP3 bytes produced by upstream.")
+ADMISSION_REJECTED = REGISTRY.counter(
+    "tts_admission_rejected_total",
+    "Requests refused with 429 by the budget that ran out.",
+    ("bucket",),
+)
+LOCAL_LATENCY = REGISTRY.histogram(
+    "tts_local_duration_seconds",
+    "Local CPU engine synthesis latency by routing reason.",
+    ("reason",),
+)
+
+REGISTRY.collect("tts_synth_cache_total", "counter", "Synthesis cache lookups by result.", lambda: [
+    ("", {"result": "hit"}, SYNTH_CACHE.hits),
+    ("", {"result": "miss"}, SYNTH_CACHE.misses),
+])
+REGISTRY.collect("tts_synth_calls_total", "counter", "Cache-miss syntheses: upstream calls vs coalesced followers.", lambda: [
+    ("", {"kind": "upstream"}, IN_FLIGHT.leaders),
+    ("", {"kind": "coalesced"}, IN_FLIGHT.coalesced),
+])
+REGISTRY.collect("tts_synth_in_flight", "gauge", "Distinct upstream syntheses in flight.", lambda: [
+    ("", {}, len(IN_FLIGHT)),
+])
+REGISTRY.collect("tts_jobs", "gauge", "Background jobs waiting and running.", lambda: [
+    ("", {"state": "queued"}, JOBS.stats()["queued"]),
+    ("", {"state": "running"}, JOBS.running),
+])
+REGISTRY.collect("tts_jobs_finished_total", "counter", "Background jobs finished by outcome.", lambda: [
+    ("", {"outcome": "done"}, JOBS.completed),
+    ("", {"outcome": "error"}, JOBS.failed),
+])
+REGISTRY.collect("tts_hedges_total", "counter", "Hedged upstream calls fired and won.", lambda: [
+    ("", {"outcome": "fired"}, HEDGER.fired),
+    ("", {"outcome": "won"}, HEDGER.won),
+])
+REGISTRY.collect("tts_breaker_open", "gauge", "1 while the upstream circuit is not closed.", lambda: [
+    ("", {}, 0 if BREAKER.state == "closed" else 1),
+])
+REGISTRY.collect("tts_upstream_connections_total", "counter", "Upstream requests and new connections.", lambda: [
+    ("", {"kind": "requests"}, UPSTREAM_STATS.requests),
+    ("", {"kind": "new"}, UPSTREAM_STATS.connects),
+    ("", {"kind": "tls_handshakes"}, UPSTREAM_STATS.tls_handshakes),
+])
+
+
+SENTENCE_BREAK = re.compile(r"(?<=[.!?…])\s+")
 
-# In-memory store: audio_id -> (created_ts, mp3_bytes)
 # NOTE: On Render free plan, instance can restart/spin down -> memory clears.
-AUDIO_STORE: Dict[str, Tuple[float, bytes]] = {}
+AUDIO_STORE = create_store(
+    AUDIO_STORE_BACKEND,
+    TTL_SECONDS,
+    max_bytes=AUDIO_STORE_MAX_BYTES,
+    spill_dir=AUDIO_SPILL_DIR,
+    disk_max_bytes=AUDIO_DISK_MAX_BYTES,
+    promote_after=AUDIO_PROMOTE_AFTER,
+    directory=AUDIO_STORE_DIR,
+    sqlite_path=AUDIO_SQLITE_PATH,
+    s3_bucket=AUDIO_S3_BUCKET,
+    s3_prefix=AUDIO_S3_PREFIX,
+    s3_endpoint=AUDIO_S3_ENDPOINT,
+)
+
+# None when neither budget is configured
+ADMISSION = (
+    create_admission(
+        ADMISSION_BACKEND,
+        ADMISSION_REQUESTS_PER_MINUTE,
+        ADMISSION_REQUEST_BURST,
+        ADMISSION_CHARS_PER_MINUTE,
+        ADMISSION_CHAR_BURST,
+        path=ADMISSION_SQLITE_PATH,
+        url=ADMISSION_REDIS_URL,
+    )
+    if ADMISSION_REQUESTS_PER_MINUTE > 0 or ADMISSION_CHARS_PER_MINUTE > 0
+    else None
+)
 
 
 # -----------------------------
@@ -38,6 +809,10 @@ class TTSRequest(BaseModel):
     )
     voice: Optional[str] = Field(default=DEFAULT_VOICE, description="Voice name (e.g., alloy)")
     speed: Optional[float] = Field(default=DEFAULT_SPEED, description="Speech speed")
+    quality: Optional[str] = Field(
+        default="standard",
+        description='"standard", or "fast" for the local CPU engine when it is enabled',
+    )
 
 
 class TTSResponse(BaseModel):
@@ -46,15 +821,109 @@ class TTSResponse(BaseModel):
     expires_in_seconds: int
 
 
+class TTSBatchRequest(BaseModel):
+    items: List[TTSRequest] = Field(..., description="Scripts to synthesize")
+
+
+class TTSBatchItem(BaseModel):
+    id: Optional[str] = None
+    audio_url: Optional[str] = None
+    error: Optional[str] = None
+
+
+class TTSBatchResponse(BaseModel):
+    items: List[TTSBatchItem]
+    expires_in_seconds: int
+
+
+class TTSJobRequest(TTSRequest):
+    priority: int = Field(default=0, ge=0, le=9, description="0-9; higher runs sooner")
+
+
+class TTSJobStatus(BaseModel):
+    id: str
+    status: str = Field(..., description="queued, running, done or error")
+    progress: float = Field(..., description="Fraction of segments synthesized")
+    segments_done: int
+    segments_total: int
+    audio_url: Optional[str] = None
+    error: Optional[str] = None
+    expires_in_seconds: Optional[int] = None
+
+
 # -----------------------------
 # Helpers
 # -----------------------------
-def cleanup() -> None:
-    """Remove expired audio from memory."""
-    now = time.time()
-    expired = [k for k, (ts, _) in AUDIO_STORE.items() if now - ts > TTL_SECONDS]
-    for k in expired:
-        AUDIO_STORE.pop(k, None)
+class ServerTiming:
+    """
+    Per-request stage durations for the Server-Timing header.
+    Stages that run in parallel (segments, hedges) keep their slowest
+    value rather than a sum.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float, peak: bool = False) -> None:
+        current = self.stages.get(name, 0.0)
+        self.stages[name] = max(current, seconds) if peak else current + seconds
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def header(self) -> str:
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages.items())
+
+
+SERVER_TIMING: ContextVar[Optional[ServerTiming]] = ContextVar("server_timing", default=None)
+
+
+def record_timing(name: str, seconds: float, peak: bool = False) -> None:
+    timings = SERVER_TIMING.get()
+    if timings is not None:
+        timings.add(name, seconds, peak)
+
+
+async def store_call(fn: Callable, *args):
+    """Run an AUDIO_STORE method, off the event loop for blocking backends."""
+    if AUDIO_STORE.blocking:
+        return await asyncio.to_thread(fn, *args)
+    return fn(*args)
+
+
+async def checkpoint_loop() -> None:
+    """Periodic incremental snapshots; a failed checkpoint is retried next round."""
+    while True:
+        await asyncio.sleep(AUDIO_CHECKPOINT_SECONDS)
+        try:
+            await asyncio.to_thread(AUDIO_STORE.snapshot, AUDIO_SNAPSHOT_DIR)
+        except OSError:
+            pass
+
+
+async def keepwarm_loop() -> None:
+    """
+    Touch the upstream API periodically so pooled connections (and their
+    TLS sessions) survive idle periods instead of reconnecting on a user
+    request. Uses a metadata lookup that costs no synthesis quota.
+    """
+    while True:
+        await asyncio.sleep(UPSTREAM_KEEPWARM_SECONDS)
+        try:
+            await PROVIDER.ping()
+            UPSTREAM_STATS.keepwarm_pings += 1
+        except Exception:
+            pass
+
+
+async def cleanup() -> None:
+    """Remove expired audio from the store."""
+    await store_call(AUDIO_STORE.expire)
 
 
 def get_base_url(request: Request) -> str:
@@ -68,6 +937,109 @@ def get_base_url(request: Request) -> str:
     return str(request.base_url).rstrip("/")
 
 
+def parse_range(header: Optional[str], size: int) -> Optional[List[Tuple[int, int]]]:
+    """
+    Parse a Range header into inclusive (start, end) byte ranges.
+    Returns None when the header is absent or malformed (serve the full
+    clip) and [] when no range overlaps the clip (416).
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec.strip():
+        return None
+
+    parts = [p.strip() for p in spec.split(",") if p.strip()]
+    if not parts or len(parts) > MAX_RANGES:
+        return None
+
+    ranges = []
+    for part in parts:
+        first, sep, last = part.partition("-")
+        if not sep:
+            return None
+        try:
+            if first:
+                start = int(first)
+                end = int(last) if last else size - 1
+                if last and end < start:
+                    return None
+            else:
+                suffix = int(last)
+                if suffix <= 0:
+                    continue
+                start, end = max(size - suffix, 0), size - 1
+        except ValueError:
+            return None
+        if start < size:
+            ranges.append((start, min(end, size - 1)))
+    return ranges
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """If-None-Match semantics: weak comparison, "*" matches anything."""
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+async def iter_clip(clip: StoredClip, start: int, end: int) -> AsyncIterator:
+    """Stream bytes start..end (inclusive) of a clip from AUDIO_STORE."""
+    if clip.data is not None or clip.path is not None:
+        yield await store_call(AUDIO_STORE.read_range, clip, start, end)
+        return
+    for offset in range(start, end + 1, AUDIO_READ_CHUNK_BYTES):
+        yield await store_call(AUDIO_STORE.read_range, clip, offset, min(offset + AUDIO_READ_CHUNK_BYTES - 1, end))
+
+
+def range_response(clip: StoredClip, size: int, ranges: List[Tuple[int, int]], headers: dict) -> Response:
+    """206 response for one range, or multipart/byteranges for several."""
+    if len(ranges) == 1:
+        start, end = ranges[0]
+
+        return StreamingResponse(
+            iter_clip(clip, start, end),
+            status_code=206,
+            media_type="audio/mpeg",
+            headers={
+                **headers,
+                "Content-Range": f"bytes {start}-{end}/{size}",
+                "Content-Length": str(end - start + 1),
+            },
+        )
+
+    boundary = uuid.uuid4().hex
+    heads = [
+        (
+            f"--{boundary}\r\n"
+            "Content-Type: audio/mpeg\r\n"
+            f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+        ).encode("ascii")
+        for start, end in ranges
+    ]
+    tail = f"\r\n--{boundary}--\r\n".encode("ascii")
+    length = sum(len(h) for h in heads) + sum(e - s + 1 for s, e in ranges)
+    length += 2 * (len(ranges) - 1) + len(tail)
+
+    async def multi():
+        for i, (head, (start, end)) in enumerate(zip(heads, ranges)):
+            yield (b"\r\n" + head) if i else head
+            async for chunk in iter_clip(clip, start, end):
+                yield chunk
+        yield tail
+
+    return StreamingResponse(
+        multi(),
+        status_code=206,
+        media_type=f"multipart/byteranges; boundary={boundary}",
+        headers={**headers, "Content-Length": str(length)},
+    )
+
+
 def build_tts_input(style: str, text: str) -> str:
     style = (style or "").strip()
     text = (text or "").strip()
@@ -76,131 +1048,1010 @@ def build_tts_input(style: str, text: str) -> str:
     return text
 
 
-def create_speech_mp3(input_text: str, voice: str, speed: float) -> bytes:
+async def request_speech_mp3(input_text: str, voice: str, speed: float) -> bytes:
+    """One provider call, body included."""
+    started = time.perf_counter()
+
+    def on_response() -> None:
+        record_timing("upstream_ttfb", time.perf_counter() - started, peak=True)
+
+    data = await PROVIDER.synthesize(input_text, voice, speed, on_response=on_response)
+
+    elapsed = time.perf_counter() - started
+    record_timing("upstream", elapsed, peak=True)
+    observe_upstream(len(input_text), elapsed, len(data))
+    return data
+
+
+async def create_speech_mp3(input_text: str, voice: str, speed: float) -> bytes:
+    """
+    Generate MP3 bytes via the configured provider.
+    With hedging on, a second identical call is raced against a call that
+    is slower than usual for its input length; the first success wins.
+    """
+    voice = (voice or DEFAULT_VOICE).strip() or DEFAULT_VOICE
+    size = len(input_text)
+    started = time.perf_counter()
+
+    async with BREAKER.guard():
+        delay = HEDGER.delay(size)
+        if delay is None:
+            audio = await request_speech_mp3(input_text, voice, speed)
+        else:
+            audio = await hedged_speech_mp3(input_text, voice, speed, delay)
+
+    HEDGER.observe(size, time.perf_counter() - started)
+    return audio
+
+
+async def hedged_speech_mp3(input_text: str, voice: str, speed: float, delay: float) -> bytes:
+    primary = asyncio.create_task(request_speech_mp3(input_text, voice, speed))
+    done, _ = await asyncio.wait({primary}, timeout=delay)
+    if done or not HEDGER.allow():
+        return await primary
+
+    backup = asyncio.create_task(request_speech_mp3(input_text, voice, speed))
+    pending = {primary, backup}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is backup:
+                        HEDGER.won += 1
+                    return task.result()
+        return primary.result()
+    finally:
+        primary.cancel()
+        backup.cancel()
+
+
+async def stream_speech_mp3(input_text: str, voice: str, speed: float) -> AsyncIterator[bytes]:
     """
-    Generate MP3 bytes via OpenAI TTS.
-    - Uses response_format="mp3"
-    - Tries speed; if SDK/model doesn't accept speed, retries without it.
+    Stream MP3 chunks from the provider as they arrive.
+    The upstream request is only sent once the generator is first advanced.
+    The circuit breaker judges streams by time to first chunk.
     """
     voice = (voice or DEFAULT_VOICE).strip() or DEFAULT_VOICE
 
+    BREAKER.before()
+    started = time.perf_counter()
+    recorded = False
+    produced = 0
+    try:
+        async for chunk in PROVIDER.stream(input_text, voice, speed):
+            if not recorded:
+                BREAKER.record(True, time.perf_counter() - started)
+                record_timing("upstream_ttfb", time.perf_counter() - started, peak=True)
+                recorded = True
+            produced += len(chunk)
+            yield chunk
+    except Exception:
+        BREAKER.record(False, time.perf_counter() - started)
+        recorded = True
+        raise
+    finally:
+        if not recorded:
+            BREAKER.release()
+
+    observe_upstream(len(input_text), time.perf_counter() - started, produced)
+
+
+async def local_speech_mp3(input_text: str, voice: str, speed: float, reason: str) -> bytes:
+    """Synthesize on the local CPU engine; upstream and its breaker are not involved."""
+    started = time.perf_counter()
+    data = await LOCAL.synthesize(input_text, voice, speed)
+    elapsed = time.perf_counter() - started
+    record_timing("local", elapsed, peak=True)
+    LOCAL_LATENCY.observe(elapsed, (reason,))
+    return data
+
+
+def local_reason(quality: str, input_text: str) -> Optional[str]:
+    """Why a call should go to the local engine, or None for upstream."""
+    if LOCAL is None:
+        return None
+    if quality == "fast":
+        return "fast"
+    if len(input_text) < LOCAL_TTS_MAX_CHARS:
+        return "short"
+    if LOCAL_TTS_ON_BREAKER and not BREAKER.admits():
+        return "breaker"
+    return None
+
+
+async def cached_speech_mp3(input_text: str, voice: str, speed: float, quality: str = "standard") -> bytes:
+    """
+    create_speech_mp3 behind the synthesis cache.
+    Concurrent identical calls share one upstream request.
+    Only non-empty results are cached, keyed by the engine that made them.
+    """
+    voice = (voice or DEFAULT_VOICE).strip() or DEFAULT_VOICE
+    reason = local_reason(quality, input_text)
+    model = LOCAL.model if reason else PROVIDER.model
+    key = SynthesisCache.key(model, voice, speed, input_text, TTS_FORMAT)
+
+    audio_bytes = SYNTH_CACHE.get(key)
+    if audio_bytes is not None:
+        return audio_bytes
+
+    async def produce(flight: Flight) -> None:
+        if reason:
+            data = await local_speech_mp3(input_text, voice, speed, reason)
+        else:
+            data = await create_speech_mp3(input_text, voice, speed)
+        SYNTH_CACHE.put(key, data)
+        flight.push(data)
+
+    return await IN_FLIGHT.join(key, produce).result()
+
+
+async def cached_speech_stream(
+    input_text: str, voice: str, speed: float, quality: str = "standard"
+) -> AsyncIterator[bytes]:
+    """
+    stream_speech_mp3 behind the synthesis cache.
+    Hits are yielded in one piece; misses are forwarded chunk by chunk
+    and only cached if the stream completes within the cache budget.
+    Concurrent identical calls follow the same upstream stream until it
+    outgrows the cache budget; past that, chunks are not kept and new
+    callers start their own stream, so memory per stream stays bounded.
+    Local engine clips are rendered whole, so they are yielded in one piece.
+    """
+    if local_reason(quality, input_text):
+        yield await cached_speech_mp3(input_text, voice, speed, quality)
+        return
+
+    voice = (voice or DEFAULT_VOICE).strip() or DEFAULT_VOICE
+    key = SynthesisCache.key(PROVIDER.model, voice, speed, input_text, TTS_FORMAT)
+
+    audio_bytes = SYNTH_CACHE.get(key)
+    if audio_bytes is not None:
+        yield audio_bytes
+        return
+
+    async def produce(flight: Flight) -> None:
+        size = 0
+        async for chunk in stream_speech_mp3(input_text, voice, speed):
+            size += len(chunk)
+            if flight.replay and size > SYNTH_CACHE.max_bytes:
+                IN_FLIGHT.forget(key, flight)
+                flight.stop_replay()
+            flight.push(chunk)
+        if flight.replay:
+            SYNTH_CACHE.put(key, b"".join(flight.chunks))
+
+    async for chunk in IN_FLIGHT.join(key, produce).follow():
+        yield chunk
+
+
+def split_script(text: str, max_chars: int) -> List[str]:
+    """
+    Split a script into segments of at most max_chars, breaking on
+    paragraph boundaries first, then sentences, then words.
+    Text that already fits is returned as a single segment.
+    """
+    text = (text or "").strip()
+    if max_chars <= 0 or len(text) <= max_chars:
+        return [text]
+
+    pieces: List[Tuple[str, str]] = []  # (separator before piece, piece)
+    for p, para in enumerate(re.split(r"\n\s*\n", text)):
+        for i, sentence in enumerate(SENTENCE_BREAK.split(para.strip())):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            sep = " " if i else "\n\n"
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(" ", 0, max_chars + 1)
+                cut = cut if cut > 0 else max_chars
+                pieces.append((sep, sentence[:cut]))
+                sentence, sep = sentence[cut:].lstrip(), " "
+            if sentence:
+                pieces.append((sep, sentence))
+
+    segments: List[str] = []
+    current = ""
+    for sep, piece in pieces:
+        if current and len(current) + len(sep) + len(piece) <= max_chars:
+            current += sep + piece
+        else:
+            if current:
+                segments.append(current)
+            current = piece
+    if current:
+        segments.append(current)
+    return segments
+
+
+def id3_size(head: bytes) -> int:
+    """Length of the ID3v2 tag at the start of head (its first 10 bytes suffice), 0 if none."""
+    if len(head) < 10 or head[:3] != b"ID3":
+        return 0
+    size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+    footer = 10 if head[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def strip_id3(data: bytes) -> bytes:
+    """Drop a leading ID3v2 tag so stitched segments are plain MP3 frames."""
+    return data[id3_size(data):]
+
+
+async def strip_id3_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """strip_id3 for audio arriving in chunks, however the tag is split across them."""
+    head = b""
+    skip: Optional[int] = None
+    async for chunk in chunks:
+        if skip is None:
+            head += chunk
+            if len(head) < 10:
+                continue
+            skip, chunk, head = id3_size(head), head, b""
+        if skip:
+            cut = min(skip, len(chunk))
+            chunk, skip = chunk[cut:], skip - cut
+        if chunk:
+            yield chunk
+    if head:
+        yield head
+
+
+def take_sentences(buffer: str, final: bool = False) -> Tuple[List[str], str]:
+    """
+    Split incrementally received text into complete sentences and the
+    unfinished tail. A sentence is complete once whitespace follows its
+    end punctuation; a tail longer than SEGMENT_MAX_CHARS is cut at a word
+    boundary instead of waiting. With final, the tail is a sentence too.
+    """
+    parts = SENTENCE_BREAK.split(buffer)
+    tail = "" if final else parts.pop()
+
+    sentences: List[str] = []
+    for part in parts:
+        sentences.extend(seg for seg in split_script(part, SEGMENT_MAX_CHARS) if seg)
+    while SEGMENT_MAX_CHARS > 0 and len(tail) > SEGMENT_MAX_CHARS:
+        cut = tail.rfind(" ", 0, SEGMENT_MAX_CHARS + 1)
+        cut = cut if cut > 0 else SEGMENT_MAX_CHARS
+        if tail[:cut].strip():
+            sentences.append(tail[:cut].strip())
+        tail = tail[cut:]
+    return sentences, tail
+
+
+async def synthesize_text(
+    segments: List[str],
+    voice: str,
+    speed: float,
+    quality: str = "standard",
+    on_segment: Optional[Callable[[int, bytes], Awaitable[None]]] = None,
+) -> bytes:
+    """
+    Synthesize all segments concurrently (bounded by SEGMENT_CONCURRENCY)
+    and stitch the MP3s in order. One failed segment cancels the rest.
+    on_segment(index, audio) is awaited as each segment finishes.
+    """
+    sem = asyncio.Semaphore(max(SEGMENT_CONCURRENCY, 1))
+
+    async def one(index: int, segment: str) -> bytes:
+        async with queued(sem):
+            data = await cached_speech_mp3(segment, voice, speed, quality)
+        if not data:
+            raise RuntimeError("Empty audio returned")
+        if on_segment is not None:
+            await on_segment(index, data)
+        return data
+
+    if len(segments) == 1:
+        return await one(0, segments[0])
+
+    tasks = [asyncio.create_task(one(i, seg)) for i, seg in enumerate(segments)]
+    try:
+        parts = await asyncio.gather(*tasks)
+    finally:
+        # After the first failure, stop spending upstream quota on the rest.
+        for task in tasks:
+            task.cancel()
+    return parts[0] + b"".join(strip_id3(p) for p in parts[1:])
+
+
+async def synthesize_segments(
+    segments: List[str], voice: str, speed: float, quality: str = "standard"
+) -> AsyncIterator[bytes]:
+    """
+    Stream stitched audio for a segmented script.
+    The first segment is forwarded chunk by chunk while the next ones are
+    synthesized in the background, then emitted in order. At most
+    SEGMENT_CONCURRENCY - 1 segments run or wait unsent at a time: the
+    next one starts only once an earlier one has been yielded, so memory
+    stays flat however long the script or slow the client.
+    """
+    window = max(SEGMENT_CONCURRENCY - 1, 1)
+    rest = iter(segments[1:])
+    pending: Deque[asyncio.Task] = deque()
+
+    def fill() -> None:
+        for segment in itertools.islice(rest, window - len(pending)):
+            pending.append(asyncio.create_task(cached_speech_mp3(segment, voice, speed, quality)))
+
     try:
-        audio = client.audio.speech.create(
-            model="gpt-4o-mini-tts",
-            voice=voice,
-            input=input_text,
-            response_format="mp3",
-            speed=float(speed),
+        fill()
+        async for chunk in cached_speech_stream(segments[0], voice, speed, quality):
+            yield chunk
+        while pending:
+            data = await pending.popleft()
+            if not data:
+                raise RuntimeError("Empty audio returned")
+            yield strip_id3(data)
+            fill()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def prime_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Pull the first chunk eagerly so upstream errors surface before the
+    response headers are sent, then replay it ahead of the rest.
+    """
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = b""
+    if not first:
+        raise RuntimeError("Empty audio returned")
+
+    async def replay() -> AsyncIterator[bytes]:
+        yield first
+        async for chunk in chunks:
+            yield chunk
+
+    return replay()
+
+
+def prepare_request(req: TTSRequest) -> Tuple[List[str], str, float, str]:
+    """
+    Validate a TTSRequest and return (segments, voice, speed, quality).
+    quality is "standard" or "fast" (the local engine, when enabled).
+    """
+    started = time.perf_counter()
+    text = (req.text or "").strip()
+    if not text:
+        raise HTTPException(status_code=400, detail="text is empty")
+
+    voice = (req.voice or DEFAULT_VOICE).strip() or DEFAULT_VOICE
+    speed = float(req.speed or DEFAULT_SPEED)
+    quality = (req.quality or "standard").strip().lower()
+    if quality not in ("standard", "fast"):
+        raise HTTPException(status_code=400, detail='quality must be "standard" or "fast"')
+    validated = time.perf_counter()
+    segments = [build_tts_input(req.style or "", seg) for seg in split_script(text, SEGMENT_MAX_CHARS)]
+    record_timing("validate", validated - started)
+    record_timing("build", time.perf_counter() - validated)
+    return segments, voice, speed, quality
+
+
+def key_digest(key: str) -> str:
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+KNOWN_KEY_DIGESTS = frozenset(key_digest(k) for k in ADMISSION_API_KEYS)
+
+
+def client_id(request: Union[Request, WebSocket]) -> str:
+    """
+    Admission key: a digest of the caller's API key if it is one of
+    ADMISSION_API_KEYS, else its IP. Unknown keys are ignored, so minting
+    new ones does not buy fresh buckets.
+    """
+    auth = request.headers.get("authorization", "")
+    key = (request.headers.get("x-api-key") or (auth[7:] if auth[:7].lower() == "bearer " else "")).strip()
+    digest = key_digest(key) if key else ""
+    if digest in KNOWN_KEY_DIGESTS:
+        return "key:" + digest
+    if ADMISSION_TRUST_FORWARDED:
+        hops = [h.strip() for h in request.headers.get("x-forwarded-for", "").split(",") if h.strip()]
+        if hops:
+            return "ip:" + hops[-1]
+    return "ip:" + (request.client.host if request.client else "unknown")
+
+
+async def admit(request: Union[Request, WebSocket], requests: int, chars: int) -> None:
+    """Charge the caller's buckets, or answer 429 before any upstream work starts."""
+    if ADMISSION is None:
+        return
+    if ADMISSION.blocking:
+        decision = await asyncio.to_thread(ADMISSION.take, client_id(request), requests, chars)
+    else:
+        decision = ADMISSION.take(client_id(request), requests, chars)
+    if not decision.allowed:
+        ADMISSION_REJECTED.inc(1, (decision.bucket,))
+        raise HTTPException(
+            status_code=429,
+            detail=f"rate limit exceeded ({decision.bucket})",
+            headers={"Retry-After": str(max(math.ceil(decision.retry_after), 1))},
+        )
+
+
+@asynccontextmanager
+async def queued(sem: asyncio.Semaphore):
+    """Acquire a concurrency slot, recording the wait as the "queue" stage."""
+    started = time.perf_counter()
+    async with sem:
+        record_timing("queue", time.perf_counter() - started, peak=True)
+        yield
+
+
+async def run_job(job: Job) -> None:
+    """
+    JobQueue worker body: synthesize a job's script and store the clip.
+    Each segment is also stored as a clip of its own the moment it is
+    ready, so event subscribers can start playback before the job ends.
+    """
+    SERVER_TIMING.set(None)
+    sizes: Dict[int, int] = {}
+    segment_ids: Dict[int, str] = {}
+
+    async def on_segment(index: int, data: bytes) -> None:
+        segment_ids[index] = uuid.uuid4().hex
+        await store_call(AUDIO_STORE.put, segment_ids[index], data)
+        job.done += 1
+        job.emit("segment-completed", {
+            "index": index,
+            "segments_done": job.done,
+            "segments_total": len(job.segments),
+            "bytes": len(data),
+            "audio_id": segment_ids[index],
+        })
+        sizes[index] = len(data)
+        if job.ready not in sizes:
+            return
+        while job.ready in sizes:
+            job.ready_bytes += sizes.pop(job.ready)
+            job.ready += 1
+        job.emit("bytes-ready", {"segments_ready": job.ready, "bytes": job.ready_bytes})
+
+    audio_bytes = await synthesize_text(job.segments, job.voice, job.speed, job.quality, on_segment)
+    if len(job.segments) == 1:
+        # The lone segment clip already is the whole script.
+        job.audio_id = segment_ids[0]
+        return
+    audio_id = uuid.uuid4().hex
+    await store_call(AUDIO_STORE.put, audio_id, audio_bytes)
+    job.audio_id = audio_id
+
+
+JOBS = JobQueue(run_job, JOB_WORKERS, JOB_MAX_QUEUED, TTL_SECONDS)
+
+
+def job_status(job: Job, request: Request) -> TTSJobStatus:
+    status = TTSJobStatus(
+        id=job.id,
+        status=job.status,
+        progress=round(job.progress, 3),
+        segments_done=job.done,
+        segments_total=len(job.segments),
+        error=job.error,
+    )
+    if job.audio_id is not None:
+        status.audio_url = f"{get_base_url(request)}/audio/{job.audio_id}.mp3"
+        status.expires_in_seconds = max(int(job.finished + TTL_SECONDS - time.time()), 0)
+    return status
+
+
+def observe_upstream(input_chars: int, seconds: float, audio_bytes: int) -> None:
+    bucket = bisect.bisect_left(INPUT_CHAR_BUCKETS, input_chars)
+    label = str(INPUT_CHAR_BUCKETS[bucket]) if bucket < len(INPUT_CHAR_BUCKETS) else "+Inf"
+    UPSTREAM_LATENCY.observe(seconds, (label,))
+    AUDIO_BYTES.inc(audio_bytes)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware timing each HTTP request until its body is sent,
+    labelled by route template (not raw path) and status.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        HTTP_STATE["in_flight"] += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_STATE["in_flight"] -= 1
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_LATENCY.observe(time.perf_counter() - started, (route, scope["method"], str(status[0])))
+
+
+app.add_middleware(MetricsMiddleware)
+
+
+def runtime_gauges() -> str:
+    """Thread pool and executor saturation; must run on the event loop."""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    executor = getattr(asyncio.get_running_loop(), "_default_executor", None)
+    queue = getattr(executor, "_work_queue", None)
+    return (
+        metrics.gauge(
+            "tts_threadpool_tokens",
+            "AnyIO worker thread tokens (borrowed vs total).",
+            [({"state": "borrowed"}, limiter.borrowed_tokens), ({"state": "total"}, limiter.total_tokens)],
         )
-    except TypeError:
-        # Some combinations may not accept speed keyword.
-        audio = client.audio.speech.create(
-            model="gpt-4o-mini-tts",
-            voice=voice,
-            input=input_text,
-            response_format="mp3",
+        + metrics.gauge(
+            "tts_executor_queue_depth",
+            "Jobs waiting for the asyncio default executor.",
+            [({}, queue.qsize() if queue is not None else 0)],
         )
+        + metrics.gauge("tts_http_in_flight", "HTTP requests being served.", [({}, HTTP_STATE["in_flight"])])
+    )
 
-    if hasattr(audio, "read"):
-        return audio.read()
 
-    return getattr(audio, "content", b"")
+# AUDIO_STORE stats fields exported by /metrics: (kind, help). Backends
+# report only the fields that apply to them.
+STORE_METRICS = {
+    "entries": ("gauge", "Clips held by AUDIO_STORE."),
+    "bytes": ("gauge", "Bytes held by AUDIO_STORE (memory tier for the memory backend)."),
+    "max_bytes": ("gauge", "AUDIO_STORE byte cap (0 = unlimited)."),
+    "disk_entries": ("gauge", "Clips spilled to disk by the memory store."),
+    "disk_bytes": ("gauge", "Bytes spilled to disk by the memory store."),
+    "unmapped_entries": ("gauge", "Restored clips not yet mapped into memory."),
+    "evictions": ("counter", "Clips dropped to stay under the byte caps."),
+    "demotions": ("counter", "Clips moved from memory to disk."),
+    "promotions": ("counter", "Clips moved from disk back to memory."),
+}
+
+
+def store_metrics(stats: dict) -> str:
+    """One family per AUDIO_STORE stat: sizes as gauges, event counts as counters."""
+    body = ""
+    for field, (kind, help) in STORE_METRICS.items():
+        if field not in stats:
+            continue
+        if kind == "counter":
+            body += metrics.counter(f"tts_audio_store_{field}_total", help, [({}, stats[field])])
+        else:
+            body += metrics.gauge(f"tts_audio_store_{field}", help, [({}, stats[field])])
+    return body
 
 
 # -----------------------------
 # Routes
 # -----------------------------
 @app.get("/")
-def root():
-    return {"ok": True, "docs": "/docs", "recommended": "POST /tts/mp3 for direct playback"}
+async def root():
+    return {
+        "ok": True,
+        "docs": "/docs",
+        "recommended": "POST /tts/mp3 for direct playback",
+        "store": await store_call(AUDIO_STORE.stats),
+        "synthesis": {
+            "cache_hits": SYNTH_CACHE.hits,
+            "cache_misses": SYNTH_CACHE.misses,
+            "upstream_calls": IN_FLIGHT.leaders,
+            "coalesced": IN_FLIGHT.coalesced,
+            "in_flight": len(IN_FLIGHT),
+        },
+        "upstream": UPSTREAM_STATS.stats(),
+        "hedging": HEDGER.stats(),
+        "breaker": BREAKER.stats(),
+        "admission": ADMISSION.stats() if ADMISSION is not None else None,
+        "jobs": JOBS.stats(),
+        "local": {"enabled": LOCAL is not None, "model": LOCAL.model if LOCAL is not None else None},
+    }
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text exposition."""
+    stats = await store_call(AUDIO_STORE.stats)
+    body = REGISTRY.render() + store_metrics(stats) + runtime_gauges()
+    return Response(content=body, media_type="text/plain; version=0.0.4")
 
 
 @app.post("/tts", response_model=TTSResponse)
-def tts(req: TTSRequest, request: Request):
+async def tts(req: TTSRequest, request: Request, response: Response):
     """
     Returns a JSON with audio_url that points to /audio/{id}.mp3.
     NOTE: /audio endpoint reads from in-memory store.
     On Render free plan, instance restarts/spins down -> memory clears -> link may fail.
     Recommended: use POST /tts/mp3 for direct playback.
     """
-    cleanup()
-
-    text = (req.text or "").strip()
-    if not text:
-        raise HTTPException(status_code=400, detail="text is empty")
-
-    voice = (req.voice or DEFAULT_VOICE).strip() or DEFAULT_VOICE
-    speed = float(req.speed or DEFAULT_SPEED)
-    tts_input = build_tts_input(req.style or "", text)
+    timings = ServerTiming()
+    SERVER_TIMING.set(timings)
+    segments, voice, speed, quality = prepare_request(req)
+    await admit(request, 1, sum(len(s) for s in segments))
+    with timings.stage("cleanup"):
+        await cleanup()
 
     try:
-        audio_bytes = create_speech_mp3(tts_input, voice, speed)
+        audio_bytes = await synthesize_text(segments, voice, speed, quality)
         if not audio_bytes:
             raise RuntimeError("Empty audio returned")
 
         audio_id = uuid.uuid4().hex
-        AUDIO_STORE[audio_id] = (time.time(), audio_bytes)
+        with timings.stage("store"):
+            await store_call(AUDIO_STORE.put, audio_id, audio_bytes)
 
         base_url = get_base_url(request)
+        response.headers["Server-Timing"] = timings.header()
         return TTSResponse(
             id=audio_id,
             audio_url=f"{base_url}/audio/{audio_id}.mp3",
             expires_in_seconds=TTL_SECONDS,
         )
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"TTS failed: {str(e)}",
+            headers={"Retry-After": str(max(int(e.retry_after), 1))},
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"TTS failed: {str(e)}")
 
 
 @app.post("/tts/mp3")
-def tts_mp3(req: TTSRequest):
+async def tts_mp3(req: TTSRequest, request: Request):
     """
     ✅ Recommended endpoint:
     Returns MP3 bytes directly (no in-memory lookup needed).
+    Upstream audio is forwarded as it arrives, so playback can start
+    before synthesis finishes. Long scripts are split into segments that
+    are synthesized in parallel and stitched in order.
     Perfect for mobile: one request -> instant playback/download.
+    Server-Timing covers the work before the first byte is sent.
     """
-    cleanup()
-
-    text = (req.text or "").strip()
-    if not text:
-        raise HTTPException(status_code=400, detail="text is empty")
-
-    voice = (req.voice or DEFAULT_VOICE).strip() or DEFAULT_VOICE
-    speed = float(req.speed or DEFAULT_SPEED)
-    tts_input = build_tts_input(req.style or "", text)
+    timings = ServerTiming()
+    SERVER_TIMING.set(timings)
+    segments, voice, speed, quality = prepare_request(req)
+    await admit(request, 1, sum(len(s) for s in segments))
+    with timings.stage("cleanup"):
+        await cleanup()
 
     try:
-        audio_bytes = create_speech_mp3(tts_input, voice, speed)
-        if not audio_bytes:
-            raise RuntimeError("Empty audio returned")
+        chunks = await prime_stream(synthesize_segments(segments, voice, speed, quality))
 
         return StreamingResponse(
-            io.BytesIO(audio_bytes),
+            chunks,
             media_type="audio/mpeg",
             headers={
                 # inline = play in browser when possible
                 "Content-Disposition": 'inline; filename="tts.mp3"',
                 "Cache-Control": "no-store",
+                "Server-Timing": timings.header(),
             },
         )
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"TTS failed: {str(e)}",
+            headers={"Retry-After": str(max(int(e.retry_after), 1))},
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"TTS failed: {str(e)}")
 
 
+@app.post("/tts/batch", response_model=TTSBatchResponse)
+async def tts_batch(batch: TTSBatchRequest, request: Request):
+    """
+    Synthesize many scripts in one round trip.
+    Identical items are synthesized and stored once and share an id.
+    Results come back in request order; a failed item carries an error
+    instead of failing the whole batch. Admission charges the batch as one
+    request plus the input characters of its distinct items, all or nothing.
+    """
+    if not batch.items:
+        raise HTTPException(status_code=400, detail="items is empty")
+    if len(batch.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"at most {BATCH_MAX_ITEMS} items per batch")
+
+    base_url = get_base_url(request)
+    sem = asyncio.Semaphore(max(BATCH_CONCURRENCY, 1))
+
+    async def one(segments: List[str], voice: str, speed: float, quality: str) -> TTSBatchItem:
+        try:
+            async with queued(sem):
+                audio_bytes = await synthesize_text(segments, voice, speed, quality)
+            if not audio_bytes:
+                raise RuntimeError("Empty audio returned")
+
+            audio_id = uuid.uuid4().hex
+            await store_call(AUDIO_STORE.put, audio_id, audio_bytes)
+            return TTSBatchItem(id=audio_id, audio_url=f"{base_url}/audio/{audio_id}.mp3")
+        except Exception as e:
+            return TTSBatchItem(error=f"TTS failed: {str(e)}")
+
+    slots: List[Union[TTSBatchItem, int]] = []
+    unique: Dict[Tuple, int] = {}
+    jobs = []
+    for item in batch.items:
+        try:
+            segments, voice, speed, quality = prepare_request(item)
+        except HTTPException as e:
+            slots.append(TTSBatchItem(error=e.detail))
+            continue
+        key = (tuple(segments), voice, speed, quality)
+        if key not in unique:
+            unique[key] = len(jobs)
+            jobs.append((segments, voice, speed, quality))
+        slots.append(unique[key])
+
+    await admit(request, 1, sum(len(s) for job in jobs for s in job[0]))
+    await cleanup()
+    results = await asyncio.gather(*(one(*job) for job in jobs))
+    return TTSBatchResponse(
+        items=[slot if isinstance(slot, TTSBatchItem) else results[slot] for slot in slots],
+        expires_in_seconds=TTL_SECONDS,
+    )
+
+
+@app.post("/tts/jobs", response_model=TTSJobStatus, status_code=202)
+async def submit_job(req: TTSJobRequest, request: Request, response: Response):
+    """
+    Queue a script for background synthesis and return its job id at once,
+    so long scripts don't hold a connection open for the whole synthesis.
+    Poll GET /tts/jobs/{id}; once done, audio_url points to /audio/{id}.mp3.
+    """
+    segments, voice, speed, quality = prepare_request(req)
+    await admit(request, 1, sum(len(s) for s in segments))
+    await cleanup()
+
+    job = Job(uuid.uuid4().hex, segments, voice, speed, quality, req.priority)
+    try:
+        JOBS.submit(job)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+    response.headers["Location"] = f"/tts/jobs/{job.id}"
+    return job_status(job, request)
+
+
+@app.get("/tts/jobs/{job_id}", response_model=TTSJobStatus)
+async def get_job(job_id: str, request: Request):
+    """Status and progress of a job; finished jobs are kept as long as their audio."""
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found (expired or invalid id)")
+    return job_status(job, request)
+
+
+@app.get("/tts/jobs/{job_id}/events")
+async def job_events(job_id: str, request: Request):
+    """
+    Server-Sent Events for a job, so clients need not poll:
+    segment-completed carries the URL of that segment's playable clip,
+    bytes-ready reports the in-order playable prefix as it grows, and
+    done (with the full audio_url) or error ends the stream.
+    Past events are replayed first; reconnects resume after Last-Event-ID.
+    """
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found (expired or invalid id)")
+
+    base_url = get_base_url(request)
+    last_id = (request.headers.get("last-event-id") or "").strip()
+    start = int(last_id) + 1 if last_id.isdigit() else 0
+
+    async def stream() -> AsyncIterator[str]:
+        async for event in job.follow(start, JOB_EVENTS_KEEPALIVE_SECONDS):
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            event_id, name, data = event
+            if "audio_id" in data:
+                data = dict(data)
+                data["audio_url"] = f"{base_url}/audio/{data.pop('audio_id')}.mp3"
+            yield f"id: {event_id}\nevent: {name}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.websocket("/tts/ws")
+async def tts_ws(ws: WebSocket):
+    """
+    Text in, audio out, for scripts that are still being generated.
+    The client sends JSON text frames: {"text": "..."} appends to the
+    script, optionally with voice / style / speed / quality for the
+    sentences that follow, and {"end": true} flushes the rest.
+    Each sentence is synthesized as soon as it is complete and streamed
+    back in script order: a {"event": "sentence"} frame, then its MP3 as
+    binary frames. At most SEGMENT_CONCURRENCY sentences are synthesized
+    or waiting to be sent at once; past that, messages are not read until
+    the socket catches up. The stream ends with {"event": "done"}, or
+    {"event": "error"} and a close.
+    """
+    await ws.accept()
+    # One slot per sentence started but not yet sent, released by send_audio.
+    ahead = asyncio.Semaphore(max(SEGMENT_CONCURRENCY, 1))
+    # Per-sentence chunk queues in script order; None marks the end of the script.
+    order: "asyncio.Queue[Optional[Tuple[str, asyncio.Queue]]]" = asyncio.Queue()
+    tasks: List[asyncio.Task] = []
+
+    async def pump(input_text: str, voice: str, speed: float, quality: str, out: asyncio.Queue) -> None:
+        try:
+            async for chunk in cached_speech_stream(input_text, voice, speed, quality):
+                out.put_nowait(chunk)
+            out.put_nowait(None)
+        except Exception as e:
+            out.put_nowait(e)
+
+    async def sentence_audio(out: asyncio.Queue) -> AsyncIterator[bytes]:
+        while True:
+            chunk = await out.get()
+            if isinstance(chunk, Exception):
+                raise chunk
+            if chunk is None:
+                return
+            yield chunk
+
+    async def receive_message():
+        """Next JSON text frame; binary frames are invalid messages."""
+        message = await ws.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000))
+        if message.get("text") is None:
+            raise ValueError("expected a JSON text frame")
+        return json.loads(message["text"])
+
+    async def send_audio() -> Optional[str]:
+        """Forward audio in order; returns an error message if synthesis failed."""
+        index = 0
+        while True:
+            item = await order.get()
+            if item is None:
+                return None
+            text, out = item
+            await ws.send_json({"event": "sentence", "index": index, "text": text})
+            chunks = sentence_audio(out)
+            try:
+                async for chunk in (strip_id3_stream(chunks) if index else chunks):
+                    await ws.send_bytes(chunk)
+            except CircuitOpenError as e:
+                return f"TTS failed: {str(e)} (retry after {max(int(e.retry_after), 1)}s)"
+            except Exception as e:
+                return f"TTS failed: {str(e)}"
+            ahead.release()
+            index += 1
+
+    async def reserve() -> bool:
+        """Wait for a sentence slot; False if send_audio stopped first."""
+        slot = asyncio.create_task(ahead.acquire())
+        await asyncio.wait({slot, writer}, return_when=asyncio.FIRST_COMPLETED)
+        if slot.done():
+            return True
+        slot.cancel()
+        return False
+
+    writer = asyncio.create_task(send_audio())
+    voice, style, speed, quality = DEFAULT_VOICE, "", DEFAULT_SPEED, "standard"
+    buffer = ""
+    code = 1000
+    try:
+        try:
+            await admit(ws, 1, 0)
+            while True:
+                receive = asyncio.create_task(receive_message())
+                done, _ = await asyncio.wait({receive, writer}, return_when=asyncio.FIRST_COMPLETED)
+                if receive not in done:
+                    receive.cancel()
+                    break
+                msg = receive.result()
+                if not isinstance(msg, dict):
+                    raise ValueError("expected a JSON object")
+                voice = (msg.get("voice") or voice).strip() or DEFAULT_VOICE
+                style = msg.get("style", style) or ""
+                speed = float(msg.get("speed") or speed)
+                quality = (msg.get("quality") or quality).strip().lower()
+                if quality not in ("standard", "fast"):
+                    raise ValueError('quality must be "standard" or "fast"')
+
+                end = bool(msg.get("end"))
+                sentences, buffer = take_sentences(buffer + (msg.get("text") or ""), final=end)
+                for sentence in sentences:
+                    input_text = build_tts_input(style, sentence)
+                    await admit(ws, 0, len(input_text))
+                    if not await reserve():
+                        break
+                    out: asyncio.Queue = asyncio.Queue()
+                    tasks.append(asyncio.create_task(pump(input_text, voice, speed, quality, out)))
+                    order.put_nowait((sentence, out))
+                else:
+                    if not end:
+                        continue
+                    order.put_nowait(None)
+                # Script ended, or send_audio gave up on a failed sentence.
+                break
+        except HTTPException as e:
+            code = 1008
+            await ws.send_json({"event": "error", "error": e.detail, "retry_after": (e.headers or {}).get("Retry-After")})
+        except (ValueError, TypeError, AttributeError) as e:
+            code = 1003
+            await ws.send_json({"event": "error", "error": f"invalid message: {str(e)}"})
+
+        if code == 1000:
+            error = await writer
+            if error is None:
+                await ws.send_json({"event": "done"})
+            else:
+                code = 1011
+                await ws.send_json({"event": "error", "error": error})
+        await ws.close(code=code)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        writer.cancel()
+        for task in tasks:
+            task.cancel()
+
+
 @app.get("/audio/{audio_id}.mp3")
-def get_audio(audio_id: str):
+async def get_audio(audio_id: str, request: Request):
     """
     Compatibility endpoint for /tts JSON flow.
-    Reads MP3 bytes from in-memory store.
+    Serves from memory, from local files via sendfile, or streams from
+    the configured AUDIO_STORE backend.
+    Honors single and multi-range requests (206) for seeking players.
+    Clips never change once stored, so responses carry a strong ETag
+    and are cacheable until the clip expires.
     Can fail after instance restart/spin-down on free plan.
     """
-    cleanup()
-    item = AUDIO_STORE.get(audio_id)
-    if not item:
+    await cleanup()
+    clip = await store_call(AUDIO_STORE.get, audio_id)
+    if not clip:
         raise HTTPException(status_code=404, detail="audio not found (expired or invalid id)")
 
-    _, audio_bytes = item
-    return Response(
-        content=audio_bytes,
+    max_age = max(int(clip.created + TTL_SECONDS - time.time()), 0)
+    headers = {
+        "Cache-Control": f"public, max-age={max_age}, immutable",
+        "ETag": clip.etag,
+        "Accept-Ranges": "bytes",
+    }
+    if etag_matches(request.headers.get("if-none-match"), clip.etag):
+        return Response(status_code=304, headers=headers)
+
+    size = clip.size
+    ranges = parse_range(request.headers.get("range"), size)
+    if_range = request.headers.get("if-range")
+    if ranges and if_range and if_range.strip() != clip.etag:
+        ranges = None
+    if ranges == []:
+        raise HTTPException(
+            status_code=416,
+            detail="requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    if ranges:
+        return range_response(clip, size, ranges, headers)
+
+    if clip.path is not None:
+        return FileResponse(clip.path, media_type="audio/mpeg", headers=headers)
+
+    if clip.data is not None:
+        return Response(
+            # Restored clips are mmaps; a view avoids copying them.
+            content=clip.data if isinstance(clip.data, bytes) else memoryview(clip.data),
+            media_type="audio/mpeg",
+            headers=headers,
+        )
+
+    return StreamingResponse(
+        iter_clip(clip, 0, size - 1),
         media_type="audio/mpeg",
-        headers={"Cache-Control": "no-store"},
+        headers={**headers, "Content-Length": str(size)},
     )
@@ -0,0 +1,55 @@
+"""
+cleanup() cost per request: full dict scan vs the MemoryStore expiry index.
+
+Fills both stores with N live clips (nothing due to expire, the common
+case on the hot path), then times repeated cleanup passes.
+
+Run from the repo root:
+    python benchmarks/bench_cleanup.py --sizes 10000,100000
+"""
+import argparse
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage import MemoryStore  # noqa: E402
+
+TTL = 3600
+CLIP = b"\x00" * 16
+
+
+def legacy_cleanup(store: dict) -> None:
+    now = time.time()
+    expired = [k for k, (ts, _) in store.items() if now - ts > TTL]
+    for k in expired:
+        store.pop(k, None)
+
+
+def fill(n: int):
+    legacy = {}
+    indexed = MemoryStore(TTL)
+    now = time.time()
+    for i in range(n):
+        legacy[f"id{i}"] = (now, CLIP)
+        indexed.put(f"id{i}", CLIP)
+    return legacy, indexed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'clips':>8} {'full scan us':>13} {'index us':>10} {'speedup':>8}")
+    for n in (int(x) for x in args.sizes.split(",")):
+        legacy, indexed = fill(n)
+        scan = timeit.timeit(lambda: legacy_cleanup(legacy), number=args.repeat) / args.repeat
+        index = timeit.timeit(indexed.expire, number=args.repeat) / args.repeat
+        print(f"{n:>8} {scan * 1e6:>13.1f} {index * 1e6:>10.2f} {scan / index:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
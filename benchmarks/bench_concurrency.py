@@ -0,0 +1,73 @@
+"""
+Concurrency scaling: blocking sync handler vs the async request path.
+
+Both sides fake the upstream with a fixed latency so no quota is spent.
+"before" mimics the old `def` route (blocking call in Starlette's worker
+threadpool); "after" drives the real app.py routes with the synthetic provider.
+
+Run from the repo root:
+    python benchmarks/bench_concurrency.py --latency 0.5 --levels 10,50,200,500
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import Response
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing app builds the upstream client; keep it offline (no OPENAI_API_KEY needed).
+os.environ.setdefault("TTS_PROVIDER", "synthetic")
+import app as tts_app  # noqa: E402
+from providers import SyntheticProvider  # noqa: E402
+
+FAKE_MP3 = b"\xff\xf3" + b"\x00" * 4094
+
+
+def blocking_app(latency: float) -> FastAPI:
+    """The pre-async shape: sync route, blocking upstream call."""
+    legacy = FastAPI()
+
+    @legacy.post("/tts/mp3")
+    def tts_mp3():
+        time.sleep(latency)
+        return Response(content=FAKE_MP3, media_type="audio/mpeg")
+
+    return legacy
+
+
+async def drive(asgi_app, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=asgi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as http:
+        async def one(i: int):
+            r = await http.post("/tts/mp3", json={"text": f"line {i}"})
+            r.raise_for_status()
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(concurrency)))
+        return time.perf_counter() - t0
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.5, help="fake upstream latency (s)")
+    parser.add_argument("--levels", default="10,50,200,500", help="comma-separated concurrency levels")
+    args = parser.parse_args()
+
+    tts_app.PROVIDER = SyntheticProvider(latency=args.latency)
+    tts_app.SYNTH_CACHE.max_bytes = 0
+    legacy = blocking_app(args.latency)
+
+    print(f"upstream latency {args.latency:.3f}s")
+    print(f"{'concurrency':>11} {'before s':>9} {'before rps':>11} {'after s':>9} {'after rps':>10}")
+    for level in (int(x) for x in args.levels.split(",")):
+        before = await drive(legacy, level)
+        after = await drive(tts_app.app, level)
+        print(f"{level:>11} {before:>9.2f} {level / before:>11.1f} {after:>9.2f} {level / after:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""
+Local CPU fallback vs the upstream path: latency per call and event-loop lag.
+
+"upstream" is the synthetic provider with a fixed latency (no quota is
+spent); "local" is LocalProvider rendering in its process pool, either
+the built-in synthetic engine or a real one via --command. Event-loop lag
+is sampled while each level runs, to check local synthesis never blocks it.
+
+Run from the repo root:
+    python benchmarks/bench_local.py --latency 0.8 --chars 80,400,1500 --concurrency 1,8
+    python benchmarks/bench_local.py --command "espeak-ng --stdout | lame --quiet - -"
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from providers import LocalProvider, SyntheticProvider  # noqa: E402
+
+WORDS = "the quick brown fox jumps over a lazy dog while the band plays on".split()
+
+
+def script(chars: int, i: int) -> str:
+    words, size, n = [], 0, i
+    while size < chars:
+        word = WORDS[n % len(WORDS)]
+        words.append(word)
+        size += len(word) + 1
+        n += 1
+    return (" ".join(words)[:chars - 1] + ".") if chars > 1 else "."
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+async def loop_lag(stop: asyncio.Event, samples: List[float], interval: float = 0.005) -> None:
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - t0 - interval)
+
+
+async def run(provider, chars: int, concurrency: int, rounds: int):
+    latencies: List[float] = []
+    lag: List[float] = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(loop_lag(stop, lag))
+
+    async def one(i: int) -> None:
+        t0 = time.perf_counter()
+        data = await provider.synthesize(script(chars, i), "alloy", 1.0)
+        latencies.append(time.perf_counter() - t0)
+        if not data:
+            raise RuntimeError("empty audio")
+
+    for r in range(rounds):
+        await asyncio.gather(*(one(r * concurrency + i) for i in range(concurrency)))
+    stop.set()
+    await sampler
+    return latencies, lag
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.8, help="fake upstream latency (s)")
+    parser.add_argument("--chars", default="80,400,1500", help="comma-separated script lengths")
+    parser.add_argument("--concurrency", default="1,8", help="comma-separated concurrency levels")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=2, help="local engine processes")
+    parser.add_argument("--command", default="", help="local engine command (default: synthetic)")
+    args = parser.parse_args()
+
+    upstream = SyntheticProvider(latency=args.latency)
+    local = LocalProvider(command=args.command, workers=args.workers)
+    await local.synthesize("warm up the pool.", "alloy", 1.0)
+
+    print(f"upstream latency {args.latency:.3f}s, local engine {local.model}, {args.workers} workers")
+    print(f"{'engine':>8} {'chars':>6} {'conc':>5} {'p50 ms':>8} {'p95 ms':>8} {'max lag ms':>11}")
+    try:
+        for chars in (int(x) for x in args.chars.split(",")):
+            for level in (int(x) for x in args.concurrency.split(",")):
+                for name, provider in (("upstream", upstream), ("local", local)):
+                    latencies, lag = await run(provider, chars, level, args.rounds)
+                    print(
+                        f"{name:>8} {chars:>6} {level:>5} {percentile(latencies, 0.5) * 1000:>8.1f}"
+                        f" {percentile(latencies, 0.95) * 1000:>8.1f} {max(lag, default=0.0) * 1000:>11.1f}"
+                    )
+    finally:
+        await local.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
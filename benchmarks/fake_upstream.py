@@ -0,0 +1,117 @@
+"""
+Local stand-in for the OpenAI audio/speech endpoint, for offline benchmarks.
+
+Serves POST /v1/audio/speech with chunked MP3 (silent MPEG-1 Layer III
+frames, length proportional to the input) after a sampled latency, and
+GET /v1/models/{id} for keep-warm pings. Stdlib only.
+
+    python benchmarks/fake_upstream.py --port 9100 --latency lognormal:0.4,0.5 --error-rate 0.01
+
+Point the app at it with OPENAI_BASE_URL=http://127.0.0.1:9100/v1 and any
+OPENAI_API_KEY. Set UPSTREAM_MAX_RETRIES=0 too, or injected errors are
+retried by the SDK and only show up as latency (loadgen.py --spawn does).
+"""
+import argparse
+import json
+import math
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 128 kbps, 44.1 kHz, no padding: 417-byte frames of ~26 ms each.
+FRAME = b"\xff\xfb\x90\x64" + b"\x00" * 413
+
+
+def parse_latency(spec: str):
+    """fixed:S | uniform:LO,HI | lognormal:MEDIAN,SIGMA (seconds)."""
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v]
+    if kind == "fixed":
+        return lambda: values[0]
+    if kind == "uniform":
+        return lambda: random.uniform(values[0], values[1])
+    if kind == "lognormal":
+        mu = math.log(values[0])
+        return lambda: random.lognormvariate(mu, values[1])
+    raise ValueError(f"unknown latency spec: {spec}")
+
+
+def make_mp3(chars: int, frames_per_char: float) -> bytes:
+    return FRAME * max(int(chars * frames_per_char), 1)
+
+
+def make_handler(args):
+    latency = parse_latency(args.latency)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *a):
+            pass
+
+        def _json(self, status: int, payload: dict) -> None:
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if "/models/" in self.path:
+                model = self.path.rsplit("/", 1)[-1]
+                return self._json(200, {"id": model, "object": "model", "created": 0, "owned_by": "fake"})
+            self._json(404, {"error": {"message": "not found"}})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not self.path.endswith("/audio/speech"):
+                return self._json(404, {"error": {"message": "not found"}})
+
+            time.sleep(max(latency(), 0.0))
+            if random.random() < args.error_rate:
+                return self._json(args.error_status, {"error": {"message": "injected failure", "type": "server_error"}})
+
+            audio = make_mp3(len(payload.get("input", "")), args.frames_per_char)
+            self.send_response(200)
+            self.send_header("Content-Type", "audio/mpeg")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i in range(0, len(audio), args.chunk_bytes):
+                chunk = audio[i:i + args.chunk_bytes]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.flush()
+                if args.chunk_interval:
+                    time.sleep(args.chunk_interval)
+            self.wfile.write(b"0\r\n\r\n")
+
+    return Handler
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", default="lognormal:0.4,0.5", help="time to first byte distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--frames-per-char", type=float, default=2.5, help="~15 chars/s of speech")
+    parser.add_argument("--chunk-bytes", type=int, default=8192)
+    parser.add_argument("--chunk-interval", type=float, default=0.0, help="pause between chunks (s)")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args))
+    server.daemon_threads = True
+    print(f"fake upstream on http://{args.host}:{args.port}/v1 latency={args.latency}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
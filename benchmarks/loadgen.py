@@ -0,0 +1,261 @@
+"""
+Load generator for app.py against the local fake upstream (fully offline).
+
+Drives POST /tts, POST /tts/mp3 and GET /audio/{id}.mp3 at fixed
+concurrency levels and reports req/s, latency percentiles, time to first
+byte for /tts/mp3, errors and the app's resident memory (Linux /proc).
+
+With --spawn it starts benchmarks/fake_upstream.py and uvicorn itself:
+    python benchmarks/loadgen.py --spawn --concurrency 1,16,64 --requests 400
+
+Or point it at a running app (and its pid for memory numbers):
+    python benchmarks/loadgen.py --base-url http://127.0.0.1:8000 --pid 12345
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+def rss_kib(pid: int) -> Dict[str, int]:
+    """VmRSS / VmHWM of a process, in KiB."""
+    out = {}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    key, value = line.split(":", 1)
+                    out[key] = int(value.split()[0])
+    except FileNotFoundError:
+        pass
+    return out
+
+
+class MemorySampler:
+    """Tracks the peak RSS of a process while a run is in progress."""
+
+    def __init__(self, pid: Optional[int], interval: float = 0.1):
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            self.peak = max(self.peak, rss_kib(self.pid).get("VmRSS", 0))
+            await asyncio.sleep(self.interval)
+
+    def __enter__(self):
+        self.peak = 0
+        if self.pid:
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        if self._task is not None:
+            self._task.cancel()
+
+
+class Texts:
+    """Request scripts; repeat_ratio of them come from a small pool (cache hits)."""
+
+    def __init__(self, words: int, repeat_ratio: float, pool: int = 20):
+        self.words = words
+        self.repeat_ratio = repeat_ratio
+        self.pool = pool
+        self._counter = itertools.count()
+
+    def next(self) -> str:
+        if random.random() < self.repeat_ratio:
+            n = f"shared {random.randrange(self.pool)}"
+        else:
+            n = f"unique {next(self._counter)} {random.random()}"
+        filler = " ".join(["steady"] * max(self.words - 3, 0))
+        return f"Line {n}. {filler}."
+
+
+async def one_request(http: httpx.AsyncClient, route: str, texts: Texts, ids: List[str]):
+    """Returns (latency, ttfb) in seconds; raises on HTTP errors."""
+    started = time.perf_counter()
+    if route == "tts":
+        r = await http.post("/tts", json={"text": texts.next()})
+        r.raise_for_status()
+        return time.perf_counter() - started, None
+    if route == "tts_mp3":
+        ttfb = None
+        async with http.stream("POST", "/tts/mp3", json={"text": texts.next()}) as r:
+            r.raise_for_status()
+            async for _ in r.aiter_raw():
+                if ttfb is None:
+                    ttfb = time.perf_counter() - started
+        return time.perf_counter() - started, ttfb
+    if route == "audio":
+        r = await http.get(f"/audio/{random.choice(ids)}.mp3")
+        r.raise_for_status()
+        return time.perf_counter() - started, None
+    raise ValueError(route)
+
+
+async def run(http: httpx.AsyncClient, route: str, concurrency: int, total: int, texts: Texts, ids: List[str], pid):
+    latencies: List[float] = []
+    ttfbs: List[float] = []
+    errors = 0
+    issued = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while next(issued) < total:
+            try:
+                latency, ttfb = await one_request(http, route, texts, ids)
+                latencies.append(latency)
+                if ttfb is not None:
+                    ttfbs.append(ttfb)
+            except (httpx.HTTPError, OSError):
+                errors += 1
+
+    with MemorySampler(pid) as memory:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "route": route,
+        "concurrency": concurrency,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "ttfb_p50": percentile(ttfbs, 0.50) if ttfbs else None,
+        "errors": errors,
+        "rss_peak_mib": memory.peak / 1024 if memory.peak else None,
+    }
+
+
+def print_row(row: dict) -> None:
+    ttfb = f"{row['ttfb_p50'] * 1000:9.1f}" if row["ttfb_p50"] is not None else f"{'-':>9}"
+    rss = f"{row['rss_peak_mib']:8.1f}" if row["rss_peak_mib"] is not None else f"{'-':>8}"
+    print(
+        f"{row['route']:>8} {row['concurrency']:>5} {row['rps']:>8.1f} "
+        f"{row['p50'] * 1000:>8.1f} {row['p95'] * 1000:>8.1f} {row['p99'] * 1000:>8.1f} "
+        f"{ttfb} {row['errors']:>6} {rss}",
+        flush=True,
+    )
+
+
+async def wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as http:
+        while True:
+            try:
+                await http.get(url)
+                return
+            except httpx.HTTPError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"{url} did not come up")
+                await asyncio.sleep(0.2)
+
+
+def spawn(args) -> List[subprocess.Popen]:
+    upstream = subprocess.Popen(
+        [
+            sys.executable, os.path.join(ROOT, "benchmarks", "fake_upstream.py"),
+            "--port", str(args.upstream_port),
+            "--latency", args.latency,
+            "--error-rate", str(args.error_rate),
+            "--chunk-interval", str(args.chunk_interval),
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    env = dict(
+        os.environ,
+        OPENAI_BASE_URL=f"http://127.0.0.1:{args.upstream_port}/v1",
+        OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY", "sk-offline-benchmark"),
+        # Let injected upstream errors reach the client instead of becoming retry latency.
+        UPSTREAM_MAX_RETRIES="0",
+    )
+    app = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(args.app_port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    return [upstream, app]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="")
+    parser.add_argument("--pid", type=int, default=0, help="app pid for memory sampling")
+    parser.add_argument("--spawn", action="store_true", help="start fake upstream + uvicorn")
+    parser.add_argument("--app-port", type=int, default=8765)
+    parser.add_argument("--upstream-port", type=int, default=9100)
+    parser.add_argument("--latency", default="lognormal:0.4,0.5", help="fake upstream latency (see fake_upstream.py)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--chunk-interval", type=float, default=0.0)
+    parser.add_argument("--routes", default="tts,tts_mp3,audio")
+    parser.add_argument("--concurrency", default="1,16,64")
+    parser.add_argument("--requests", type=int, default=200, help="requests per route and level")
+    parser.add_argument("--words", type=int, default=30, help="words per script")
+    parser.add_argument("--repeat-ratio", type=float, default=0.0, help="share of scripts drawn from a small pool")
+    parser.add_argument("--audio-ids", type=int, default=50, help="clips created for the audio route")
+    args = parser.parse_args()
+
+    procs: List[subprocess.Popen] = []
+    base_url, pid = args.base_url, args.pid
+    if args.spawn:
+        procs = spawn(args)
+        base_url, pid = f"http://127.0.0.1:{args.app_port}", procs[1].pid
+    if not base_url:
+        parser.error("--base-url or --spawn is required")
+
+    try:
+        await wait_ready(base_url + "/")
+        texts = Texts(args.words, args.repeat_ratio)
+        levels = [int(x) for x in args.concurrency.split(",")]
+        routes = [r.strip() for r in args.routes.split(",") if r.strip()]
+        limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as http:
+            ids: List[str] = []
+            if "audio" in routes:
+                for _ in range(args.audio_ids):
+                    r = await http.post("/tts", json={"text": texts.next()})
+                    r.raise_for_status()
+                    ids.append(r.json()["id"])
+
+            print(f"app {base_url} latency={args.latency} error_rate={args.error_rate} words={args.words}")
+            print(
+                f"{'route':>8} {'conc':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+                f"{'ttfb ms':>9} {'errors':>6} {'rss MiB':>8}"
+            )
+            for route in routes:
+                for level in levels:
+                    print_row(await run(http, route, level, args.requests, texts, ids, pid))
+            if pid:
+                final = rss_kib(pid)
+                print(f"app rss {final.get('VmRSS', 0) / 1024:.1f} MiB, high-water {final.get('VmHWM', 0) / 1024:.1f} MiB")
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""
+In-memory stand-in for an S3-compatible bucket, and an offline check of
+storage.S3Store against it (no boto3, MinIO or network needed).
+
+StandInS3 implements the client calls S3Store makes: put_object,
+head_object, get_object (with Range), delete_objects, and raises
+ClientError for missing keys the way botocore does.
+
+Run from the repo root:
+    python benchmarks/s3_standin.py
+"""
+import io
+import os
+import sys
+import time
+from typing import Dict, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage import S3Store  # noqa: E402
+
+
+class ClientError(Exception):
+    def __init__(self, code: str, operation: str):
+        super().__init__(f"An error occurred ({code}) when calling the {operation} operation")
+        self.response = {"Error": {"Code": code}}
+
+
+class StandInS3:
+    """A single-process bucket store keyed by (bucket, key)."""
+
+    exceptions = type("Exceptions", (), {"ClientError": ClientError})
+
+    def __init__(self):
+        self.objects: Dict[Tuple[str, str], Tuple[bytes, Dict[str, str]]] = {}
+        self.calls: Dict[str, int] = {}
+
+    def _count(self, name: str) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def _object(self, bucket: str, key: str, operation: str) -> Tuple[bytes, Dict[str, str]]:
+        try:
+            return self.objects[(bucket, key)]
+        except KeyError:
+            raise ClientError("404" if operation == "HeadObject" else "NoSuchKey", operation) from None
+
+    def put_object(self, Bucket, Key, Body, ContentType=None, Metadata=None):
+        self._count("put_object")
+        self.objects[(Bucket, Key)] = (bytes(Body), dict(Metadata or {}))
+        return {}
+
+    def head_object(self, Bucket, Key):
+        self._count("head_object")
+        body, meta = self._object(Bucket, Key, "HeadObject")
+        return {"ContentLength": len(body), "Metadata": meta}
+
+    def get_object(self, Bucket, Key, Range=None):
+        self._count("get_object")
+        body, meta = self._object(Bucket, Key, "GetObject")
+        if Range:
+            first, _, last = Range[len("bytes="):].partition("-")
+            body = body[int(first):int(last) + 1]
+        return {"Body": io.BytesIO(body), "ContentLength": len(body), "Metadata": meta}
+
+    def delete_objects(self, Bucket, Delete):
+        self._count("delete_objects")
+        for obj in Delete["Objects"]:
+            self.objects.pop((Bucket, obj["Key"]), None)
+        return {}
+
+
+def check() -> None:
+    s3 = StandInS3()
+    store = S3Store(60, "clips", prefix="audio/", client=s3)
+    data = bytes(range(256)) * 4
+
+    store.put("a", data)
+    clip = store.get("a")
+    assert clip is not None and clip.size == len(data) and clip.data is None and clip.path is None
+    assert store.read_range(clip, 0, 9) == data[:10]
+    assert store.read_range(clip, 1000, 1023) == data[1000:]
+    assert store.get("missing") is None
+
+    # Another worker sharing the bucket finds the clip through HEAD.
+    other = S3Store(60, "clips", prefix="audio/", client=s3)
+    heads = s3.calls.get("head_object", 0)
+    remote = other.get("a")
+    assert remote is not None and remote.etag == clip.etag and remote.size == clip.size
+    assert s3.calls["head_object"] == heads + 1
+
+    # Overwrites keep the byte count right.
+    store.put("a", data[:100])
+    assert store.stats()["bytes"] == 100 and store.get("a").size == 100
+
+    store.put("b", b"b" * 10)
+    assert store.expire(time.time() + 30) == 0
+    assert store.expire(time.time() + 120) == 2
+    assert not s3.objects and store.get("a") is None and store.stats() == {"backend": "s3", "entries": 0, "bytes": 0}
+
+    # Expired clips are refused even when only HEAD knows them.
+    store.put("c", b"c")
+    s3.objects[("clips", "audio/c.mp3")][1]["created"] = repr(time.time() - 3600)
+    assert other.get("c") is None
+    print("S3Store ok against the stand-in:", ", ".join(f"{k}={v}" for k, v in sorted(s3.calls.items())))
+
+
+if __name__ == "__main__":
+    check()
@@ -0,0 +1,272 @@
+"""
+Speech synthesis providers behind create_speech_mp3 / stream_speech_mp3.
+
+A provider turns (input text, voice, speed) into MP3, either in one piece
+(synthesize) or as chunks (stream). Pick one with TTS_PROVIDER:
+openai (default) or synthetic, a deterministic offline engine for tests,
+benchmarks and local development. local is the CPU fallback engine that
+app.py routes to when upstream is unavailable or speed matters more than
+fidelity.
+"""
+import asyncio
+import hashlib
+import math
+import multiprocessing
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Callable, Optional
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, joint stereo, no CRC, no padding.
+MP3_FRAME_HEADER = b"\xff\xfb\x90\x64"
+MP3_FRAME_BYTES = 417
+MP3_FRAME_SECONDS = 1152 / 44100
+# 4-byte header + 32 bytes of zeroed side info; the rest of each frame is
+# ancillary data that decoders skip.
+MP3_SIDE_INFO_BYTES = 32
+
+
+class Provider:
+    """Interface shared by all providers."""
+
+    name = "provider"
+    model = ""
+
+    async def synthesize(
+        self,
+        input_text: str,
+        voice: str,
+        speed: float,
+        on_response: Optional[Callable[[], None]] = None,
+    ) -> bytes:
+        """Whole clip; on_response fires once the first byte is available."""
+        raise NotImplementedError
+
+    def stream(self, input_text: str, voice: str, speed: float) -> AsyncIterator[bytes]:
+        raise NotImplementedError
+
+    async def ping(self) -> None:
+        """Cheap liveness/keep-warm call; no-op by default."""
+
+    async def close(self) -> None:
+        pass
+
+
+class OpenAIProvider(Provider):
+    """
+    OpenAI audio/speech.
+    - Uses response_format="mp3"
+    - Tries speed; if SDK/model doesn't accept speed, retries without it.
+    """
+
+    name = "openai"
+
+    def __init__(self, client, model: str, response_format: str = "mp3", chunk_bytes: int = 16384):
+        self.client = client
+        self.model = model
+        self.response_format = response_format
+        self.chunk_bytes = chunk_bytes
+
+    async def synthesize(self, input_text, voice, speed, on_response=None) -> bytes:
+        try:
+            audio = await self.client.audio.speech.create(
+                model=self.model,
+                voice=voice,
+                input=input_text,
+                response_format=self.response_format,
+                speed=float(speed),
+            )
+        except TypeError:
+            # Some combinations may not accept speed keyword.
+            audio = await self.client.audio.speech.create(
+                model=self.model,
+                voice=voice,
+                input=input_text,
+                response_format=self.response_format,
+            )
+
+        if on_response is not None:
+            on_response()
+        if hasattr(audio, "aread"):
+            return await audio.aread()
+        return getattr(audio, "content", b"")
+
+    async def stream(self, input_text, voice, speed) -> AsyncIterator[bytes]:
+        try:
+            stream = self.client.audio.speech.with_streaming_response.create(
+                model=self.model,
+                voice=voice,
+                input=input_text,
+                response_format=self.response_format,
+                speed=float(speed),
+            )
+        except TypeError:
+            stream = self.client.audio.speech.with_streaming_response.create(
+                model=self.model,
+                voice=voice,
+                input=input_text,
+                response_format=self.response_format,
+            )
+
+        async with stream as response:
+            async for chunk in response.iter_bytes(self.chunk_bytes):
+                if chunk:
+                    yield chunk
+
+    async def ping(self) -> None:
+        await self.client.models.retrieve(self.model)
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+class SyntheticProvider(Provider):
+    """
+    Deterministic offline engine: valid, silent MP3 frames whose count
+    follows speaking time (chars_per_second at speed 1.0). Each frame's
+    ancillary bytes carry a digest of (voice, speed, text), so different
+    inputs give different clips and identical inputs identical ones.
+    latency adds a fixed delay before the first byte.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, chars_per_second: float = 15.0, latency: float = 0.0, chunk_bytes: int = 16384):
+        self.model = "synthetic-mp3"
+        self.chars_per_second = chars_per_second
+        self.latency = latency
+        self.chunk_bytes = chunk_bytes
+
+    def frame_count(self, input_text: str, speed: float) -> int:
+        seconds = len(input_text) / (self.chars_per_second * max(float(speed), 0.1))
+        return max(math.ceil(seconds / MP3_FRAME_SECONDS), 1)
+
+    def _frame(self, input_text: str, voice: str, speed: float) -> bytes:
+        seed = hashlib.sha256(f"{voice}\0{float(speed)!r}\0{input_text}".encode("utf-8")).digest()
+        filler = MP3_FRAME_BYTES - len(MP3_FRAME_HEADER) - MP3_SIDE_INFO_BYTES
+        ancillary = (seed * (filler // len(seed) + 1))[:filler]
+        return MP3_FRAME_HEADER + b"\x00" * MP3_SIDE_INFO_BYTES + ancillary
+
+    def render(self, input_text: str, voice: str, speed: float) -> bytes:
+        return self._frame(input_text, voice, speed) * self.frame_count(input_text, speed)
+
+    async def synthesize(self, input_text, voice, speed, on_response=None) -> bytes:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if on_response is not None:
+            on_response()
+        return self.render(input_text, voice, speed)
+
+    async def stream(self, input_text, voice, speed) -> AsyncIterator[bytes]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        frame = self._frame(input_text, voice, speed)
+        per_chunk = max(self.chunk_bytes // MP3_FRAME_BYTES, 1)
+        remaining = self.frame_count(input_text, speed)
+        while remaining:
+            n = min(per_chunk, remaining)
+            remaining -= n
+            yield frame * n
+            await asyncio.sleep(0)
+
+
+def script_text(input_text: str) -> str:
+    """The script part of a build_tts_input prompt; local engines cannot follow style notes."""
+    if input_text.startswith("[STYLE]") and "[SCRIPT]\n" in input_text:
+        return input_text.split("[SCRIPT]\n", 1)[1].strip()
+    return input_text
+
+
+def render_local(command: str, input_text: str, speed: float, timeout: float) -> bytes:
+    """
+    Worker-process entry point for LocalProvider.
+    command reads the script on stdin and writes MP3 on stdout; "{speed}"
+    in it is replaced by the requested speed. Without a command the
+    synthetic engine renders silence (benchmarks only).
+    """
+    text = script_text(input_text)
+    if not command:
+        return SyntheticProvider().render(text, "local", speed)
+    result = subprocess.run(
+        command.replace("{speed}", f"{float(speed):g}"),
+        shell=True,
+        input=text.encode("utf-8"),
+        capture_output=True,
+        timeout=timeout,
+    )
+    if result.returncode != 0:
+        detail = result.stderr.decode("utf-8", "replace").strip().splitlines()
+        raise RuntimeError(f"local TTS exited with {result.returncode}" + (f": {detail[-1]}" if detail else ""))
+    return result.stdout
+
+
+class LocalProvider(Provider):
+    """
+    CPU-only synthesis in a process pool, so rendering never blocks the
+    event loop or holds the GIL. Lower fidelity than upstream; voice is
+    ignored. The pool is started on first use, from a forkserver (or
+    spawn) context so workers are not forked from a threaded server.
+    """
+
+    name = "local"
+
+    def __init__(self, command: str = "", workers: int = 2, timeout: float = 60.0, chunk_bytes: int = 16384):
+        self.command = command
+        self.workers = max(workers, 1)
+        self.timeout = timeout
+        self.chunk_bytes = chunk_bytes
+        self.model = f"local:{command}" if command else "local:synthetic"
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    async def synthesize(self, input_text, voice, speed, on_response=None) -> bytes:
+        if self._pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context(method))
+        data = await asyncio.get_running_loop().run_in_executor(
+            self._pool, render_local, self.command, input_text, float(speed), self.timeout
+        )
+        if on_response is not None:
+            on_response()
+        return data
+
+    async def stream(self, input_text, voice, speed) -> AsyncIterator[bytes]:
+        data = await self.synthesize(input_text, voice, speed)
+        for i in range(0, len(data), self.chunk_bytes):
+            yield data[i:i + self.chunk_bytes]
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def create_provider(name: str, **options) -> Provider:
+    """
+    Build the provider named by TTS_PROVIDER.
+    options: client, model, response_format, chunk_bytes (openai);
+    chars_per_second, latency, chunk_bytes (synthetic);
+    command, workers, timeout, chunk_bytes (local).
+    """
+    name = (name or "openai").strip().lower()
+    if name == "openai":
+        return OpenAIProvider(
+            options["client"],
+            options["model"],
+            response_format=options.get("response_format", "mp3"),
+            chunk_bytes=options.get("chunk_bytes", 16384),
+        )
+    if name == "synthetic":
+        return SyntheticProvider(
+            chars_per_second=options.get("chars_per_second", 15.0),
+            latency=options.get("latency", 0.0),
+            chunk_bytes=options.get("chunk_bytes", 16384),
+        )
+    if name == "local":
+        if not options.get("command"):
+            raise RuntimeError("the local TTS engine requires LOCAL_TTS_COMMAND")
+        return LocalProvider(
+            command=options.get("command", ""),
+            workers=options.get("workers", 2),
+            timeout=options.get("timeout", 60.0),
+            chunk_bytes=options.get("chunk_bytes", 16384),
+        )
+    raise ValueError(f"unknown TTS_PROVIDER: {name}")
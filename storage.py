@@ -0,0 +1,679 @@
+"""
+Storage backends for synthesized clips (AUDIO_STORE in app.py).
+
+Every backend keeps clips for a fixed TTL and exposes the same small
+interface: put / get / read_range / expire / stats. Pick one with
+AUDIO_STORE_BACKEND (memory, directory, sqlite, s3).
+"""
+import hashlib
+import json
+import mmap
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+
+class StoredClip(NamedTuple):
+    """
+    A stored clip. data is set when the clip is in memory (an mmap for
+    clips restored from a snapshot) and path when it is a local file;
+    when both are None, fetch bytes via read_range.
+    """
+    id: str
+    created: float
+    size: int
+    etag: str
+    data: Optional[Union[bytes, mmap.mmap]] = None
+    path: Optional[str] = None
+
+
+def content_etag(data: bytes) -> str:
+    """Strong ETag derived from the clip bytes."""
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+class AudioStore:
+    """
+    Interface shared by all backends.
+    blocking backends do I/O on get/put and should be called off the
+    event loop.
+    """
+
+    blocking = False
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+
+    def __contains__(self, audio_id: str) -> bool:
+        return self.get(audio_id) is not None
+
+    def put(self, audio_id: str, data: bytes) -> None:
+        raise NotImplementedError
+
+    def get(self, audio_id: str) -> Optional[StoredClip]:
+        raise NotImplementedError
+
+    def read_range(self, clip: StoredClip, start: int, end: int) -> Union[bytes, memoryview]:
+        """Bytes start..end (inclusive) of a clip; a zero-copy view when in memory."""
+        if clip.data is not None:
+            return memoryview(clip.data)[start:end + 1]
+        with open(clip.path, "rb") as f:
+            f.seek(start)
+            return f.read(end - start + 1)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop expired clips; returns how many were removed."""
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        raise NotImplementedError
+
+
+class MemoryStore(AudioStore):
+    """
+    Tiered store: audio_id -> clip, in memory or spilled to a local directory.
+    Every clip shares the same TTL, so insertion order is expiry order;
+    expire() pops from the front and stops at the first live entry.
+    The memory tier is capped by total bytes (0 = unlimited): when a new
+    clip would exceed the cap, least-recently-used clips are demoted to
+    spill_dir (or dropped when spilling is off). Spilled clips read
+    promote_after times are loaded back into memory; their file stays
+    until the clip is evicted or expires, since earlier readers may still
+    be serving it by path.
+    snapshot()/restore() persist the store across restarts; restored
+    clips stay on disk until first read, then are memory-mapped.
+    With a spill_dir or a restored snapshot, get/put/expire touch files,
+    so the store reports itself as blocking.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        max_bytes: int = 0,
+        spill_dir: str = "",
+        disk_max_bytes: int = 0,
+        promote_after: int = 3,
+    ):
+        super().__init__(ttl_seconds)
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.promote_after = promote_after
+        self.evictions = 0
+        self.demotions = 0
+        self.promotions = 0
+        self._created: "OrderedDict[str, float]" = OrderedDict()
+        self._mem: "OrderedDict[str, bytes]" = OrderedDict()
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_hits: Dict[str, int] = {}
+        self._etags: Dict[str, str] = {}
+        self._lazy: Dict[str, Tuple[str, int]] = {}
+        self._bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.blocking = bool(spill_dir)
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._created)
+
+    def _path(self, audio_id: str) -> str:
+        return os.path.join(self.spill_dir, f"{audio_id}.mp3")
+
+    def _drop(self, audio_id: str) -> None:
+        # Caller holds the lock.
+        self._created.pop(audio_id, None)
+        self._etags.pop(audio_id, None)
+        self._lazy.pop(audio_id, None)
+        data = self._mem.pop(audio_id, None)
+        if data is not None:
+            self._bytes -= len(data)
+        size = self._disk.pop(audio_id, None)
+        if size is not None:
+            self._disk_bytes -= size
+            self._disk_hits.pop(audio_id, None)
+            try:
+                os.remove(self._path(audio_id))
+            except FileNotFoundError:
+                pass
+
+    def _demote(self, audio_id: str) -> None:
+        # Caller holds the lock. Moves a memory clip to disk, or drops it.
+        data = self._mem[audio_id]
+        size = len(data)
+        if audio_id in self._disk:
+            # Promoted earlier; its file is still in place.
+            del self._mem[audio_id]
+            self._bytes -= size
+            self._disk_hits[audio_id] = 0
+            self.demotions += 1
+            return
+        if not self.spill_dir or (self.disk_max_bytes and size > self.disk_max_bytes):
+            self._drop(audio_id)
+            self.evictions += 1
+            return
+
+        while self.disk_max_bytes and self._disk and self._disk_bytes + size > self.disk_max_bytes:
+            self._drop(next(iter(self._disk)))
+            self.evictions += 1
+
+        path = self._path(audio_id)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        del self._mem[audio_id]
+        self._bytes -= size
+        self._disk[audio_id] = size
+        self._disk_bytes += size
+        self._disk_hits[audio_id] = 0
+        self.demotions += 1
+
+    def _make_room(self, size: int) -> None:
+        # Caller holds the lock.
+        if self.max_bytes:
+            while self._mem and self._bytes + size > self.max_bytes:
+                self._demote(next(iter(self._mem)))
+
+    def put(self, audio_id: str, data: bytes) -> None:
+        size = len(data)
+        if self.max_bytes and size > self.max_bytes:
+            raise ValueError(f"clip of {size} bytes exceeds the store budget")
+        etag = content_etag(data)
+        with self._lock:
+            self._drop(audio_id)
+            self._make_room(size)
+            self._created[audio_id] = time.time()
+            self._etags[audio_id] = etag
+            self._mem[audio_id] = data
+            self._bytes += size
+
+    def get(self, audio_id: str) -> Optional[StoredClip]:
+        with self._lock:
+            created = self._created.get(audio_id)
+            if created is None or time.time() - created > self.ttl_seconds:
+                return None
+
+            data = self._mem.get(audio_id)
+            if data is not None:
+                self._mem.move_to_end(audio_id)
+                return StoredClip(audio_id, created, len(data), self._etags[audio_id], data)
+
+            if audio_id in self._lazy:
+                data = self._map(audio_id)
+                if data is None:
+                    return None
+                return StoredClip(audio_id, created, len(data), self._etags[audio_id], data)
+
+            self._disk.move_to_end(audio_id)
+            hits = self._disk_hits[audio_id] = self._disk_hits[audio_id] + 1
+            path = self._path(audio_id)
+            size = self._disk[audio_id]
+            if hits < self.promote_after or (self.max_bytes and size > self.max_bytes):
+                return StoredClip(audio_id, created, size, self._etags[audio_id], path=path)
+
+            with open(path, "rb") as f:
+                data = f.read()
+            self._make_room(size)
+            self._mem[audio_id] = data
+            self._bytes += size
+            self.promotions += 1
+            return StoredClip(audio_id, created, len(data), self._etags[audio_id], data)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop expired clips; returns how many were removed."""
+        now = time.time() if now is None else now
+        removed = 0
+        with self._lock:
+            while self._created:
+                audio_id, ts = next(iter(self._created.items()))
+                if now - ts <= self.ttl_seconds:
+                    break
+                self._drop(audio_id)
+                removed += 1
+        return removed
+
+    def _map(self, audio_id: str) -> Optional[mmap.mmap]:
+        # Caller holds the lock. Maps a restored blob into the memory tier.
+        path, size = self._lazy.pop(audio_id)
+        try:
+            with open(path, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        except (FileNotFoundError, ValueError):
+            self._drop(audio_id)
+            return None
+        self._make_room(size)
+        self._mem[audio_id] = data
+        self._bytes += size
+        return data
+
+    def snapshot(self, directory: str) -> int:
+        """
+        Checkpoint the store to directory. Blobs are immutable, so only
+        clips not already in the snapshot are written; blobs of clips that
+        are gone are removed. Spilled clips are indexed in place.
+        Returns the number of blobs written.
+        """
+        blob_dir = os.path.join(directory, "blobs")
+        os.makedirs(blob_dir, exist_ok=True)
+        with self._lock:
+            entries = []
+            for audio_id, created in self._created.items():
+                if audio_id in self._disk:
+                    tier, size, data = "disk", self._disk[audio_id], None
+                elif audio_id in self._lazy:
+                    tier, size, data = "memory", self._lazy[audio_id][1], None
+                else:
+                    data = self._mem[audio_id]
+                    tier, size = "memory", len(data)
+                entries.append((audio_id, created, size, self._etags[audio_id], tier, data))
+
+        written = 0
+        for audio_id, _, _, _, tier, data in entries:
+            path = os.path.join(blob_dir, f"{audio_id}.mp3")
+            if tier == "memory" and data is not None and not os.path.exists(path):
+                with open(path + ".tmp", "wb") as f:
+                    f.write(data)
+                os.replace(path + ".tmp", path)
+                written += 1
+
+        index = [
+            {"id": a, "created": c, "size": n, "etag": e, "tier": t}
+            for a, c, n, e, t, _ in entries
+        ]
+        tmp = os.path.join(directory, "index.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": 1, "clips": index}, f)
+        os.replace(tmp, os.path.join(directory, "index.json"))
+
+        keep = {f"{a}.mp3" for a, _, _, _, t, _ in entries if t == "memory"}
+        for name in os.listdir(blob_dir):
+            if name not in keep:
+                try:
+                    os.remove(os.path.join(blob_dir, name))
+                except FileNotFoundError:
+                    pass
+        return written
+
+    def restore(self, directory: str, now: Optional[float] = None) -> int:
+        """
+        Load a snapshot index written by snapshot(). Blobs are not read
+        here; each is memory-mapped the first time its clip is requested.
+        Returns the number of clips restored.
+        """
+        now = time.time() if now is None else now
+        try:
+            with open(os.path.join(directory, "index.json")) as f:
+                index = json.load(f).get("clips", [])
+        except (FileNotFoundError, ValueError):
+            return 0
+
+        restored = 0
+        with self._lock:
+            for entry in sorted(index, key=lambda e: e["created"]):
+                audio_id, created, size = entry["id"], entry["created"], entry["size"]
+                if now - created > self.ttl_seconds or audio_id in self._created:
+                    continue
+                if entry["tier"] == "disk":
+                    if not self.spill_dir or not os.path.exists(self._path(audio_id)):
+                        continue
+                    self._disk[audio_id] = size
+                    self._disk_bytes += size
+                    self._disk_hits[audio_id] = 0
+                else:
+                    path = os.path.join(directory, "blobs", f"{audio_id}.mp3")
+                    if not os.path.exists(path):
+                        continue
+                    self._lazy[audio_id] = (path, size)
+                self._created[audio_id] = created
+                self._etags[audio_id] = entry["etag"]
+                restored += 1
+            if restored:
+                self.blocking = True
+        return restored
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "entries": len(self._created),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "disk_entries": len(self._disk),
+            "disk_bytes": self._disk_bytes,
+            "unmapped_entries": len(self._lazy),
+            "evictions": self.evictions,
+            "demotions": self.demotions,
+            "promotions": self.promotions,
+        }
+
+
+class DirectoryStore(AudioStore):
+    """
+    One file per clip in a local directory, served with sendfile.
+    The expiry index lives in memory, oldest clip first, and is rebuilt
+    from file mtimes and sizes on startup so clips survive restarts.
+    Clips written by other workers sharing the directory are found with
+    os.stat on a miss. Total bytes on disk are capped (0 = unlimited) by
+    evicting the oldest clips first, the same order they expire in.
+    ETags of clips indexed that way are computed on first read.
+    """
+
+    blocking = True
+
+    def __init__(self, ttl_seconds: int, directory: str, max_bytes: int = 0):
+        super().__init__(ttl_seconds)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._index: "OrderedDict[str, Tuple[float, int, Optional[str]]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._rebuild()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _path(self, audio_id: str) -> str:
+        return os.path.join(self.directory, f"{audio_id}.mp3")
+
+    def _rebuild(self, stale_tmp_seconds: float = 300.0) -> None:
+        """Index clips left by earlier runs; drop abandoned partial writes."""
+        now = time.time()
+        found = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_file():
+                continue
+            st = entry.stat()
+            if entry.name.endswith(".tmp"):
+                if now - st.st_mtime > stale_tmp_seconds:
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass
+            elif entry.name.endswith(".mp3"):
+                found.append((st.st_mtime, entry.name[:-4], st.st_size))
+        for created, audio_id, size in sorted(found):
+            self._index[audio_id] = (created, size, None)
+            self._bytes += size
+
+    def _adopt(self, audio_id: str) -> Optional[Tuple[float, int, Optional[str]]]:
+        # A clip another worker wrote after this one started.
+        try:
+            st = os.stat(self._path(audio_id))
+        except FileNotFoundError:
+            return None
+        item = (st.st_mtime, st.st_size, None)
+        with self._lock:
+            if audio_id not in self._index:
+                self._index[audio_id] = item
+                self._bytes += st.st_size
+        return item
+
+    def _drop(self, audio_id: str) -> None:
+        # Caller holds the lock.
+        item = self._index.pop(audio_id, None)
+        if item is None:
+            return
+        self._bytes -= item[1]
+        try:
+            os.remove(self._path(audio_id))
+        except FileNotFoundError:
+            pass
+
+    def put(self, audio_id: str, data: bytes) -> None:
+        size = len(data)
+        if self.max_bytes and size > self.max_bytes:
+            raise ValueError(f"clip of {size} bytes exceeds the store budget")
+        path = self._path(audio_id)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        with self._lock:
+            self._drop(audio_id)
+            while self.max_bytes and self._index and self._bytes + size > self.max_bytes:
+                self._drop(next(iter(self._index)))
+                self.evictions += 1
+            os.replace(tmp, path)
+            self._index[audio_id] = (time.time(), size, content_etag(data))
+            self._bytes += size
+
+    def get(self, audio_id: str) -> Optional[StoredClip]:
+        item = self._index.get(audio_id) or self._adopt(audio_id)
+        if item is None or time.time() - item[0] > self.ttl_seconds:
+            return None
+        created, size, etag = item
+        path = self._path(audio_id)
+        try:
+            if etag is None:
+                with open(path, "rb") as f:
+                    etag = content_etag(f.read())
+                with self._lock:
+                    if audio_id in self._index:
+                        self._index[audio_id] = (created, size, etag)
+            elif not os.path.exists(path):
+                raise FileNotFoundError(path)
+        except FileNotFoundError:
+            # Evicted or expired by another worker.
+            with self._lock:
+                self._drop(audio_id)
+            return None
+        return StoredClip(audio_id, created, size, etag, path=path)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        removed = 0
+        with self._lock:
+            while self._index:
+                audio_id, (ts, _, _) = next(iter(self._index.items()))
+                if now - ts <= self.ttl_seconds:
+                    break
+                self._drop(audio_id)
+                removed += 1
+        return removed
+
+    def stats(self) -> dict:
+        return {
+            "backend": "directory",
+            "entries": len(self._index),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+class SQLiteStore(AudioStore):
+    """
+    Clips as BLOBs in a SQLite database, shared by every worker on the host.
+    Range reads use substr() so only the requested bytes leave the database.
+    Expiry runs at most once per sweep_seconds since it is a write.
+    """
+
+    blocking = True
+
+    def __init__(self, ttl_seconds: int, path: str, sweep_seconds: float = 5.0):
+        super().__init__(ttl_seconds)
+        self.path = path
+        self.sweep_seconds = sweep_seconds
+        self._next_sweep = 0.0
+        self._local = threading.local()
+        with self._conn() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS clips ("
+                "id TEXT PRIMARY KEY, created REAL NOT NULL, size INTEGER NOT NULL, "
+                "etag TEXT NOT NULL, data BLOB NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS clips_created ON clips (created)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM clips").fetchone()[0]
+
+    def put(self, audio_id: str, data: bytes) -> None:
+        with self._conn() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO clips (id, created, size, etag, data) VALUES (?, ?, ?, ?, ?)",
+                (audio_id, time.time(), len(data), content_etag(data), sqlite3.Binary(data)),
+            )
+
+    def get(self, audio_id: str) -> Optional[StoredClip]:
+        row = self._conn().execute(
+            "SELECT created, size, etag FROM clips WHERE id = ?", (audio_id,)
+        ).fetchone()
+        if row is None or time.time() - row[0] > self.ttl_seconds:
+            return None
+        return StoredClip(audio_id, row[0], row[1], row[2])
+
+    def read_range(self, clip: StoredClip, start: int, end: int) -> bytes:
+        row = self._conn().execute(
+            "SELECT substr(data, ?, ?) FROM clips WHERE id = ?",
+            (start + 1, end - start + 1, clip.id),
+        ).fetchone()
+        return bytes(row[0]) if row else b""
+
+    def expire(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        if now < self._next_sweep:
+            return 0
+        self._next_sweep = now + self.sweep_seconds
+        with self._conn() as db:
+            cur = db.execute("DELETE FROM clips WHERE created < ?", (now - self.ttl_seconds,))
+        return cur.rowcount
+
+    def stats(self) -> dict:
+        entries, total = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM clips").fetchone()
+        return {"backend": "sqlite", "entries": entries, "bytes": total}
+
+
+class S3Store(AudioStore):
+    """
+    Clips as objects in an S3-compatible bucket (AWS, MinIO, R2, ...).
+    Needs boto3; credentials come from the usual AWS_* environment.
+    Clip metadata is indexed locally for the fast path and falls back to
+    HEAD for clips written by other workers. expire() only deletes clips
+    this process knows about; use a bucket lifecycle rule as a backstop.
+    client overrides the boto3 client (benchmarks/s3_standin.py).
+    """
+
+    blocking = True
+
+    def __init__(self, ttl_seconds: int, bucket: str, prefix: str = "audio/", endpoint_url: str = "", client=None):
+        super().__init__(ttl_seconds)
+        if client is None:
+            try:
+                import boto3
+            except ImportError as e:
+                raise RuntimeError("AUDIO_STORE_BACKEND=s3 requires boto3") from e
+            client = boto3.client("s3", endpoint_url=endpoint_url or None)
+        self.bucket = bucket
+        self.prefix = prefix
+        self._s3 = client
+        self._index: "OrderedDict[str, Tuple[float, int, str]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _key(self, audio_id: str) -> str:
+        return f"{self.prefix}{audio_id}.mp3"
+
+    def put(self, audio_id: str, data: bytes) -> None:
+        created, etag = time.time(), content_etag(data)
+        self._s3.put_object(
+            Bucket=self.bucket,
+            Key=self._key(audio_id),
+            Body=data,
+            ContentType="audio/mpeg",
+            Metadata={"created": repr(created), "etag": etag.strip('"')},
+        )
+        with self._lock:
+            old = self._index.pop(audio_id, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._index[audio_id] = (created, len(data), etag)
+            self._bytes += len(data)
+
+    def get(self, audio_id: str) -> Optional[StoredClip]:
+        item = self._index.get(audio_id)
+        if item is None:
+            try:
+                head = self._s3.head_object(Bucket=self.bucket, Key=self._key(audio_id))
+            except self._s3.exceptions.ClientError:
+                return None
+            meta = head.get("Metadata", {})
+            item = (float(meta.get("created", 0)), head["ContentLength"], f'"{meta.get("etag", "")}"')
+        created, size, etag = item
+        if time.time() - created > self.ttl_seconds:
+            return None
+        return StoredClip(audio_id, created, size, etag)
+
+    def read_range(self, clip: StoredClip, start: int, end: int) -> bytes:
+        obj = self._s3.get_object(Bucket=self.bucket, Key=self._key(clip.id), Range=f"bytes={start}-{end}")
+        return obj["Body"].read()
+
+    def expire(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        expired = []
+        with self._lock:
+            while self._index:
+                audio_id, (ts, size, _) = next(iter(self._index.items()))
+                if now - ts <= self.ttl_seconds:
+                    break
+                del self._index[audio_id]
+                self._bytes -= size
+                expired.append(audio_id)
+        for i in range(0, len(expired), 1000):
+            self._s3.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": self._key(a)} for a in expired[i:i + 1000]], "Quiet": True},
+            )
+        return len(expired)
+
+    def stats(self) -> dict:
+        return {"backend": "s3", "entries": len(self._index), "bytes": self._bytes}
+
+
+def create_store(backend: str, ttl_seconds: int, **options) -> AudioStore:
+    """
+    Build the backend named by AUDIO_STORE_BACKEND.
+    options: max_bytes, spill_dir, disk_max_bytes, promote_after (memory);
+    directory, max_bytes (directory); sqlite_path (sqlite);
+    s3_bucket, s3_prefix, s3_endpoint (s3).
+    """
+    backend = (backend or "memory").strip().lower()
+    if backend == "memory":
+        return MemoryStore(
+            ttl_seconds,
+            options.get("max_bytes", 0),
+            spill_dir=options.get("spill_dir", ""),
+            disk_max_bytes=options.get("disk_max_bytes", 0),
+            promote_after=options.get("promote_after", 3),
+        )
+    if backend == "directory":
+        return DirectoryStore(ttl_seconds, options["directory"], options.get("max_bytes", 0))
+    if backend == "sqlite":
+        return SQLiteStore(ttl_seconds, options["sqlite_path"])
+    if backend == "s3":
+        if not options.get("s3_bucket"):
+            raise RuntimeError("AUDIO_STORE_BACKEND=s3 requires AUDIO_S3_BUCKET")
+        return S3Store(
+            ttl_seconds,
+            options["s3_bucket"],
+            prefix=options.get("s3_prefix", "audio/"),
+            endpoint_url=options.get("s3_endpoint", ""),
+        )
+    raise ValueError(f"unknown AUDIO_STORE_BACKEND: {backend}")